@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""
+ARGUS Article Index
+SQLite sidecar (defense_data/index.sqlite) recording each saved JSON file's
+kind, priority, source and size. The scraper fills it in as it writes
+articles and readers bring it up to date from file mtimes, so reports can
+count and rank articles without re-reading and re-scanning every file.
+"""
+
+import json
+import os
+import sqlite3
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from keyword_matcher import KeywordMatcher
+
+INDEX_FILENAME = "index.sqlite"
+
+PRIORITY_KEYWORDS = {
+    'high': frozenset({'nuclear', 'missile', 'agni', 'terrorism', 'attack', 'weapon', 'army', 'navy', 'air force', 'border', 'security'}),
+    'medium': frozenset({'defense', 'defence', 'military', 'intelligence', 'surveillance', 'police', 'government'})
+}
+
+# Built once; each article's text is scanned a single time per priority level
+_HIGH_MATCHER = KeywordMatcher(PRIORITY_KEYWORDS['high'])
+_MEDIUM_MATCHER = KeywordMatcher(PRIORITY_KEYWORDS['medium'])
+
+_SQL_RECORD_FILE = '''
+    INSERT OR REPLACE INTO files
+    (name, mtime_ns, kind, priority, high_count, source, word_count, scraped)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def load_json(path):
+    """Parse a JSON file straight from its raw bytes."""
+    with open(path, 'rb') as f:
+        raw = f.read()
+    return orjson.loads(raw) if orjson is not None else json.loads(raw)
+
+
+def classify_article(article):
+    """Return (priority, high_count) for an article dict.
+
+    HIGH needs two distinct high keywords; MEDIUM needs one high or two
+    medium keywords; everything else is REGULAR.
+    """
+    # Join first, then lowercase the combined text in a single pass
+    text = (article.get('title', '') + ' ' + article.get('content', '')).lower()
+
+    # Count distinct keywords present
+    high_count = len(_HIGH_MATCHER.found(text))
+    if high_count >= 2:
+        return 'HIGH', high_count
+    if high_count >= 1 or len(_MEDIUM_MATCHER.found(text)) >= 2:
+        return 'MEDIUM', high_count
+    return 'REGULAR', high_count
+
+
+def open_index(data_dir):
+    """Open (creating if needed) the index for a data directory."""
+    conn = sqlite3.connect(os.path.join(data_dir, INDEX_FILENAME))
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS files (
+            name TEXT PRIMARY KEY,
+            mtime_ns INTEGER NOT NULL,
+            kind TEXT NOT NULL,
+            priority TEXT,
+            high_count INTEGER,
+            source TEXT,
+            word_count INTEGER,
+            scraped TEXT
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_files_priority ON files (kind, priority, high_count)')
+    return conn
+
+
+def record_file(conn, path, data, mtime_ns=None):
+    """Index one JSON file from its already-parsed contents.
+
+    Summary files (with 'total_articles' and 'articles') are recorded as
+    'summary'; anything that isn't a JSON object is recorded as 'invalid'
+    so it isn't re-read until it changes.
+    """
+    if mtime_ns is None:
+        mtime_ns = os.stat(path).st_mtime_ns
+    name = os.path.basename(path)
+
+    if not isinstance(data, dict):
+        row = (name, mtime_ns, 'invalid', None, None, None, None, None)
+    elif 'total_articles' in data and 'articles' in data:
+        row = (name, mtime_ns, 'summary', None, None, None, None, data.get('scraping_timestamp'))
+    else:
+        priority, high_count = classify_article(data)
+        row = (name, mtime_ns, 'article', priority, high_count,
+               data.get('source_domain', 'Unknown'), data.get('word_count', 0),
+               data.get('scraped_timestamp', ''))
+
+    conn.execute(_SQL_RECORD_FILE, row)
+
+
+def sync_index(data_dir):
+    """Bring the index in line with the JSON files on disk and return it.
+
+    Only files that are new or whose mtime changed are parsed; rows for
+    deleted files are dropped.
+    """
+    conn = open_index(data_dir)
+    indexed = dict(conn.execute('SELECT name, mtime_ns FROM files'))
+
+    with os.scandir(data_dir) as entries:
+        for entry in entries:
+            if not entry.name.endswith('.json') or not entry.is_file():
+                continue
+
+            mtime_ns = entry.stat().st_mtime_ns
+            if indexed.pop(entry.name, None) == mtime_ns:
+                continue
+
+            try:
+                data = load_json(entry.path)
+            except Exception as e:
+                print(f"Warning: Error loading {entry.path}: {e}")
+                data = None
+            record_file(conn, entry.path, data, mtime_ns)
+
+    # Whatever is left was indexed earlier but no longer exists
+    conn.executemany('DELETE FROM files WHERE name = ?', [(name,) for name in indexed])
+    conn.commit()
+    return conn
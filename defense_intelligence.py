@@ -6,15 +6,21 @@ Detects threats, military activities, terrorism, and security incidents.
 """
 
 import spacy
+import bisect
 import json
+import logging
+import mmap
 import os
 import sys
 import sqlite3
 import re
-from collections import defaultdict
+from collections import Counter, defaultdict
 from pathlib import Path
 from datetime import datetime
 
+from keyword_matcher import KeywordMatcher
+from quick_data_processor import backfill_article_categories
+
 # Defense and security keywords for threat classification
 DEFENSE_KEYWORDS = {
     'terrorism': [
@@ -47,12 +53,110 @@ DEFENSE_KEYWORDS = {
     ]
 }
 
+# Inverted keyword table: each keyword maps to every category it scores for
+# (a few keywords, e.g. 'surveillance', appear in more than one category)
+_KW_TO_CATS = {}
+for _category, _keywords in DEFENSE_KEYWORDS.items():
+    for _keyword in _keywords:
+        _KW_TO_CATS.setdefault(_keyword.lower(), []).append(_category)
+
+# All keywords compiled once so each article is scanned in a single pass
+_KEYWORD_MATCHER = KeywordMatcher(_KW_TO_CATS)
+
+# Words that mark an ORG entity as a military unit. Entities are matched
+# word by word, so plurals, compounds ('airforce', 'paramilitary') and the
+# British spelling are listed explicitly
+_MIL_WORDS = frozenset({
+    'army', 'armies', 'navy', 'navies', 'force', 'forces', 'airforce', 'airforces',
+    'military', 'paramilitary', 'paramilitaries', 'defense', 'defence', 'defenses',
+    'defences', 'regiment', 'regiments', 'regimental', 'brigade', 'brigades',
+    'battalion', 'battalions'
+})
+_WORD_RE = re.compile(r'[a-z]+')
+
+# Whole words mentioning a weapon, all stems in one alternation so the text
+# is scanned once
+_WEAPON_RE = re.compile(
+    r'\b\w*(?:missile|rocket|bomb|gun|rifle|tank|aircraft|drone)\w*\b',
+    re.IGNORECASE
+)
+
 # High-priority threat indicators
 THREAT_INDICATORS = [
     'imminent attack', 'planned attack', 'security threat', 'credible threat',
     'intelligence warning', 'alert level', 'emergency response', 'evacuation',
     'lockdown', 'high alert', 'security breach', 'suspicious activity'
 ]
+# (indicator, lowercased) pairs so articles don't re-lowercase the table
+_THREAT_INDICATORS_LOWER = tuple((indicator, indicator.lower()) for indicator in THREAT_INDICATORS)
+
+# SQL statements shared by every article write. Keeping the text identical
+# lets sqlite3's per-connection statement cache reuse the prepared statement.
+# Articles are upserted on the UNIQUE url column; with RETURNING (SQLite
+# 3.35+) the id of the new or existing row comes back from the same statement.
+_SQL_INSERT_ARTICLE = '''
+    INSERT INTO articles (title, content, url, scraped_timestamp,
+                        content_length, word_count, threat_level,
+                        relevance_score, detected_categories, key_indicators)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(url) DO UPDATE SET
+        threat_level = excluded.threat_level,
+        relevance_score = excluded.relevance_score,
+        detected_categories = excluded.detected_categories,
+        key_indicators = excluded.key_indicators
+'''
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+if _HAS_RETURNING:
+    _SQL_INSERT_ARTICLE += '    RETURNING id\n'
+
+_SQL_INSERT_ENTITY = '''
+    INSERT INTO entities (article_id, text, type, entity_category)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_INSERT_ALERT = '''
+    INSERT INTO defense_alerts (article_id, alert_type, alert_level,
+                              alert_description, created_timestamp)
+    VALUES (?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_CATEGORY = '''
+    INSERT OR IGNORE INTO article_categories (article_id, category)
+    VALUES (?, ?)
+'''
+
+_SQL_LOOKUP_URL = 'SELECT id FROM articles WHERE url = ?'
+_SQL_DELETE_ENTITIES = 'DELETE FROM entities WHERE article_id = ?'
+_SQL_DELETE_ALERTS = 'DELETE FROM defense_alerts WHERE article_id = ?'
+_SQL_DELETE_CATEGORIES = 'DELETE FROM article_categories WHERE article_id = ?'
+
+# Short articles are joined into larger spaCy documents so the per-call
+# pipeline overhead is paid once per chunk instead of once per article
+_DOC_SEPARATOR = "\n\n###DOC###\n\n"
+_BATCH_CHUNK_CHARS = 20000
+
+# Per-article analysis summaries go through logging so batch runs can mute them
+log = logging.getLogger('defense_intel')
+
+class ArticleBuf:
+    """Article text together with its lowercase form, computed once."""
+    
+    __slots__ = ('text', 'text_lower')
+    
+    def __init__(self, text):
+        self.text = text
+        self.text_lower = text.lower()
+    
+    def __len__(self):
+        return len(self.text)
+
+def load_article_json(path):
+    """Load an article JSON file, decoding straight from a memory map."""
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return json.loads(f.read().decode('utf-8'))  # mmap can't map empty files
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            return json.loads(str(mm, 'utf-8'))
 
 # Global variable to store the spaCy model
 nlp = None
@@ -78,7 +182,7 @@ def analyze_defense_relevance(text):
     Analyze text for defense and security relevance.
     
     Args:
-        text (str): Article content to analyze
+        text (str or ArticleBuf): Article content to analyze
         
     Returns:
         dict: Analysis results with relevance scores and detected categories
@@ -92,29 +196,20 @@ def analyze_defense_relevance(text):
             'key_indicators': []
         }
     
-    text_lower = text.lower()
-    detected_categories = []
-    category_scores = {}
+    text_lower = text.text_lower if isinstance(text, ArticleBuf) else text.lower()
     key_indicators = []
     
-    # Check for defense keywords
-    for category, keywords in DEFENSE_KEYWORDS.items():
-        score = 0
-        found_keywords = []
-        
-        for keyword in keywords:
-            count = text_lower.count(keyword.lower())
-            if count > 0:
-                score += count
-                found_keywords.append(keyword)
-        
-        if score > 0:
-            detected_categories.append(category)
-            category_scores[category] = score
+    # Count every keyword once and credit its categories
+    category_scores = Counter()
+    for keyword, count in _KEYWORD_MATCHER.counts(text_lower).items():
+        for category in _KW_TO_CATS[keyword]:
+            category_scores[category] += count
+    
+    detected_categories = [category for category in DEFENSE_KEYWORDS if category_scores[category]]
     
     # Check for high-priority threat indicators
-    for indicator in THREAT_INDICATORS:
-        if indicator.lower() in text_lower:
+    for indicator, indicator_lower in _THREAT_INDICATORS_LOWER:
+        if indicator_lower in text_lower:
             key_indicators.append(indicator)
     
     # Calculate overall relevance score
@@ -160,15 +255,82 @@ def extract_defense_entities(text):
     model = load_spacy_model()
     doc = model(text)
     
+    return _build_entity_result(ArticleBuf(text), doc.ents)
+
+def extract_defense_entities_batch(items, chunk_chars=_BATCH_CHUNK_CHARS):
+    """Extract defense entities for many articles with few spaCy calls.
+    
+    Args:
+        items: Iterable of (text, context) tuples
+        chunk_chars (int): Approximate size of each combined spaCy document
+        
+    Yields:
+        tuple: (entities, context) in input order, where entities matches
+        the output of extract_defense_entities(text), or is the exception
+        spaCy raised for that article
+    """
+    model = load_spacy_model()
+    
+    def flush(chunk):
+        # Rebuild the combined text and remember where each article starts
+        starts = []
+        parts = []
+        offset = 0
+        for text, _ in chunk:
+            starts.append(offset)
+            parts.append(text)
+            offset += len(text) + len(_DOC_SEPARATOR)
+        try:
+            doc = model(_DOC_SEPARATOR.join(parts))
+        except Exception:
+            # Retry the chunk one article at a time so a single bad article
+            # (e.g. one over nlp.max_length) doesn't take the others with it
+            for text, context in chunk:
+                try:
+                    yield extract_defense_entities(text), context
+                except Exception as e:
+                    yield e, context
+            return
+        
+        # Hand each entity to the article it falls in; entities that run
+        # across a separator belong to neither article
+        ents_by_article = [[] for _ in chunk]
+        for ent in doc.ents:
+            index = bisect.bisect_right(starts, ent.start_char) - 1
+            if ent.end_char <= starts[index] + len(parts[index]):
+                ents_by_article[index].append(ent)
+        
+        for (text, context), ents in zip(chunk, ents_by_article):
+            yield _build_entity_result(ArticleBuf(text), ents), context
+    
+    chunk = []
+    chunk_size = 0
+    for text, context in items:
+        invalid = not text or not isinstance(text, str)
+        if chunk and (invalid or chunk_size + len(text) > chunk_chars):
+            yield from flush(chunk)
+            chunk = []
+            chunk_size = 0
+        if invalid:
+            yield extract_defense_entities(text), context
+            continue
+        chunk.append((text, context))
+        chunk_size += len(text) + len(_DOC_SEPARATOR)
+    
+    if chunk:
+        yield from flush(chunk)
+
+def _build_entity_result(buf, ents):
+    """Classify spaCy entities found in an ArticleBuf and run the defense analysis."""
+    
     # Standard entity extraction
     persons = set()
     organizations = set()
     locations = set()
     military_units = set()
-    weapons = set()
     
     # Extract entities
-    for ent in doc.ents:
+    for ent in ents:
         entity_text = ent.text.strip()
         entity_label = ent.label_
         
@@ -182,35 +344,26 @@ def extract_defense_entities(text):
             organizations.add(entity_text)
             
             # Check if it's a military organization
-            if any(keyword in entity_text.lower() for keyword in 
-                   ['army', 'navy', 'force', 'military', 'defense', 'regiment', 'brigade', 'battalion']):
+            if not _MIL_WORDS.isdisjoint(_WORD_RE.findall(entity_text.lower())):
                 military_units.add(entity_text)
                 
         elif entity_label in ["GPE", "LOC", "FAC"]:
             locations.add(entity_text)
     
-    # Extract weapon mentions using pattern matching
-    weapon_patterns = [
-        r'\b\w*missile\w*\b', r'\b\w*rocket\w*\b', r'\b\w*bomb\w*\b',
-        r'\b\w*gun\w*\b', r'\b\w*rifle\w*\b', r'\b\w*tank\w*\b',
-        r'\b\w*aircraft\w*\b', r'\b\w*drone\w*\b'
-    ]
-    
-    for pattern in weapon_patterns:
-        matches = re.findall(pattern, text, re.IGNORECASE)
-        for match in matches:
-            if len(match) > 3:  # Avoid very short matches
-                weapons.add(match)
+    # Extract weapon mentions; lowercased so 'Missile' and 'missile' collapse
+    # into one entry, interned since the same names recur across articles
+    weapons = {sys.intern(match.lower()) for match in _WEAPON_RE.findall(buf.text)
+               if len(match) > 3}  # Avoid very short matches
     
     # Perform defense analysis
-    defense_analysis = analyze_defense_relevance(text)
+    defense_analysis = analyze_defense_relevance(buf)
     
     result = {
-        'persons': sorted(list(persons)),
-        'organizations': sorted(list(organizations)),
-        'locations': sorted(list(locations)),
-        'military_units': sorted(list(military_units)),
-        'weapons': sorted(list(weapons)),
+        'persons': sorted(persons),
+        'organizations': sorted(organizations),
+        'locations': sorted(locations),
+        'military_units': sorted(military_units),
+        'weapons': sorted(weapons),
         'defense_analysis': defense_analysis
     }
     
@@ -219,21 +372,21 @@ def extract_defense_entities(text):
                      len(result['locations']) + len(result['military_units']) + 
                      len(result['weapons']))
     
-    print(f"[ANALYSIS] Defense Intelligence Analysis:")
-    print(f"  [STATS] Total entities: {total_entities}")
-    print(f"  [PERSONS] Persons: {len(result['persons'])}")
-    print(f"  [ORGS] Organizations: {len(result['organizations'])}")
-    print(f"  [MILITARY] Military Units: {len(result['military_units'])}")
-    print(f"  [LOCATIONS] Locations: {len(result['locations'])}")
-    print(f"  [WEAPONS] Weapons: {len(result['weapons'])}")
-    print(f"  [THREAT] Threat Level: {defense_analysis['threat_level']}")
-    print(f"  [SCORE] Relevance Score: {defense_analysis['relevance_score']}/100")
+    log.info("[ANALYSIS] Defense Intelligence Analysis:")
+    log.info("  [STATS] Total entities: %d", total_entities)
+    log.info("  [PERSONS] Persons: %d", len(result['persons']))
+    log.info("  [ORGS] Organizations: %d", len(result['organizations']))
+    log.info("  [MILITARY] Military Units: %d", len(result['military_units']))
+    log.info("  [LOCATIONS] Locations: %d", len(result['locations']))
+    log.info("  [WEAPONS] Weapons: %d", len(result['weapons']))
+    log.info("  [THREAT] Threat Level: %s", defense_analysis['threat_level'])
+    log.info("  [SCORE] Relevance Score: %s/100", defense_analysis['relevance_score'])
     
     if defense_analysis['detected_categories']:
-        print(f"  [CATEGORIES] Categories: {', '.join(defense_analysis['detected_categories'])}")
+        log.info("  [CATEGORIES] Categories: %s", ', '.join(defense_analysis['detected_categories']))
     
     if defense_analysis['key_indicators']:
-        print(f"  [INDICATORS] Key Indicators: {', '.join(defense_analysis['key_indicators'])}")
+        log.info("  [INDICATORS] Key Indicators: %s", ', '.join(defense_analysis['key_indicators']))
     
     return result
 
@@ -243,6 +396,13 @@ def init_defense_db():
         conn = sqlite3.connect('defense_intelligence.db')
         cursor = conn.cursor()
         
+        # WAL is persistent: once set, readers such as the daily report no
+        # longer block on (or are blocked by) the analyzer's writes
+        cursor.execute('PRAGMA journal_mode = WAL')
+        cursor.execute('PRAGMA synchronous = NORMAL')
+        # 64 MiB page cache so repeated index lookups stay in memory
+        cursor.execute('PRAGMA cache_size = -65536')
+        
         # Enhanced articles table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS articles (
@@ -285,11 +445,34 @@ def init_defense_db():
             )
         ''')
         
+        # One row per (article, category) so category filters and reports
+        # use an index instead of LIKE scans over detected_categories
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_categories (
+                article_id INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                PRIMARY KEY (article_id, category),
+                FOREIGN KEY (article_id) REFERENCES articles (id)
+            )
+        ''')
+        # Fill in articles saved without category rows (older databases)
+        backfill_article_categories(cursor)
+        
         # Create indexes
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_threat_level ON articles (threat_level)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_relevance ON articles (relevance_score)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_scraped ON articles (scraped_timestamp)')
+        # Daily reports filter on date(scraped_timestamp); an expression index
+        # lets that predicate use an index seek instead of a table scan
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_scraped_date ON articles (date(scraped_timestamp))')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_entities_category ON entities (entity_category)')
+        # Composite join indexes supersede the single-column article_id ones
+        cursor.execute('DROP INDEX IF EXISTS idx_entities_article')
+        cursor.execute('DROP INDEX IF EXISTS idx_alerts_article')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_entities_article_category ON entities (article_id, entity_category, type)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_article_created ON defense_alerts (article_id, created_timestamp DESC)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_alerts_level ON defense_alerts (alert_level)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ac_cat ON article_categories (category)')
         
         conn.commit()
         print("✓ Defense intelligence database initialized successfully")
@@ -299,9 +482,15 @@ def init_defense_db():
         print(f"✗ Database initialization error: {e}")
         return None
 
-def save_defense_intelligence(article_data, entities_data):
-    """Save article and enhanced defense intelligence to database."""
-    conn = init_defense_db()
+def save_defense_intelligence(article_data, entities_data, conn=None):
+    """Save article and enhanced defense intelligence to database.
+    
+    Pass an open ``conn`` to reuse one connection (and its statement cache)
+    across many articles; otherwise a connection is opened and closed here.
+    """
+    owns_conn = conn is None
+    if owns_conn:
+        conn = init_defense_db()
     if not conn:
         return None
     
@@ -323,70 +512,43 @@ def save_defense_intelligence(article_data, entities_data):
         detected_categories = ','.join(defense_analysis.get('detected_categories', []))
         key_indicators = ','.join(defense_analysis.get('key_indicators', []))
         
-        # Insert article
-        try:
-            cursor.execute('''
-                INSERT INTO articles (title, content, url, scraped_timestamp, 
-                                    content_length, word_count, threat_level, 
-                                    relevance_score, detected_categories, key_indicators)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (title, content, url, scraped_timestamp, content_length, word_count,
-                  threat_level, relevance_score, detected_categories, key_indicators))
-            
-            article_id = cursor.lastrowid
-            print(f"✓ Article saved with ID: {article_id}")
-            
-        except sqlite3.IntegrityError:
-            cursor.execute('SELECT id FROM articles WHERE url = ?', (url,))
-            result = cursor.fetchone()
-            if result:
-                article_id = result[0]
-                print(f"Article already exists with ID: {article_id}. Updating...")
-                cursor.execute('DELETE FROM entities WHERE article_id = ?', (article_id,))
-                cursor.execute('DELETE FROM defense_alerts WHERE article_id = ?', (article_id,))
-            else:
-                print("✗ Failed to handle duplicate URL")
-                return None
-        
-        # Insert entities with categories
-        entity_count = 0
-        
-        # Standard entities
-        for person in entities_data.get('persons', []):
-            cursor.execute('''
-                INSERT INTO entities (article_id, text, type, entity_category)
-                VALUES (?, ?, ?, ?)
-            ''', (article_id, person, 'PERSON', 'STANDARD'))
-            entity_count += 1
-        
-        for org in entities_data.get('organizations', []):
-            cursor.execute('''
-                INSERT INTO entities (article_id, text, type, entity_category)
-                VALUES (?, ?, ?, ?)
-            ''', (article_id, org, 'ORG', 'STANDARD'))
-            entity_count += 1
-        
-        for loc in entities_data.get('locations', []):
-            cursor.execute('''
-                INSERT INTO entities (article_id, text, type, entity_category)
-                VALUES (?, ?, ?, ?)
-            ''', (article_id, loc, 'LOCATION', 'STANDARD'))
-            entity_count += 1
-        
-        # Defense-specific entities
-        for unit in entities_data.get('military_units', []):
-            cursor.execute('''
-                INSERT INTO entities (article_id, text, type, entity_category)
-                VALUES (?, ?, ?, ?)
-            ''', (article_id, unit, 'MILITARY_UNIT', 'DEFENSE'))
-            entity_count += 1
+        # Insert or update the article
+        cursor.execute(_SQL_INSERT_ARTICLE,
+                       (title, content, url, scraped_timestamp, content_length, word_count,
+                        threat_level, relevance_score, detected_categories, key_indicators))
+        if _HAS_RETURNING:
+            article_id = cursor.fetchone()[0]
+        else:
+            cursor.execute(_SQL_LOOKUP_URL, (url,))
+            article_id = cursor.fetchone()[0]
+        
+        # Replace whatever an earlier run stored for this article
+        cursor.execute(_SQL_DELETE_ENTITIES, (article_id,))
+        cursor.execute(_SQL_DELETE_ALERTS, (article_id,))
+        cursor.execute(_SQL_DELETE_CATEGORIES, (article_id,))
+        print(f"✓ Article saved with ID: {article_id}")
+        
+        # Insert entities with categories: standard entities first, then
+        # defense-specific ones
+        entity_rows = []
+        for key, entity_type, entity_category in (
+            ('persons', 'PERSON', 'STANDARD'),
+            ('organizations', 'ORG', 'STANDARD'),
+            ('locations', 'LOCATION', 'STANDARD'),
+            ('military_units', 'MILITARY_UNIT', 'DEFENSE'),
+            ('weapons', 'WEAPON', 'DEFENSE'),
+        ):
+            entity_rows.extend(
+                (article_id, text, entity_type, entity_category)
+                for text in entities_data.get(key, [])
+            )
+        cursor.executemany(_SQL_INSERT_ENTITY, entity_rows)
+        entity_count = len(entity_rows)
         
-        for weapon in entities_data.get('weapons', []):
-            cursor.execute('''
-                INSERT INTO entities (article_id, text, type, entity_category)
-                VALUES (?, ?, ?, ?)
-            ''', (article_id, weapon, 'WEAPON', 'DEFENSE'))
-            entity_count += 1
+        cursor.executemany(_SQL_INSERT_CATEGORY, [
+            (article_id, category)
+            for category in defense_analysis.get('detected_categories', [])
+        ])
         
         # Create defense alerts for high-threat articles
         if threat_level in ['HIGH', 'MEDIUM']:
@@ -394,12 +556,9 @@ def save_defense_intelligence(article_data, entities_data):
             if key_indicators:
                 alert_description += f". Key indicators: {', '.join(defense_analysis.get('key_indicators', []))}"
             
-            cursor.execute('''
-                INSERT INTO defense_alerts (article_id, alert_type, alert_level, 
-                                          alert_description, created_timestamp)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (article_id, 'THREAT_DETECTION', threat_level, alert_description, 
-                  datetime.now().isoformat()))
+            cursor.execute(_SQL_INSERT_ALERT,
+                           (article_id, 'THREAT_DETECTION', threat_level, alert_description,
+                            datetime.now().isoformat()))
         
         conn.commit()
         print(f"✓ Saved {entity_count} entities to defense intelligence database")
@@ -412,7 +571,8 @@ def save_defense_intelligence(article_data, entities_data):
         return None
         
     finally:
-        conn.close()
+        if owns_conn:
+            conn.close()
 
 def generate_defense_report():
     """Generate a comprehensive defense intelligence report."""
@@ -427,21 +587,14 @@ def generate_defense_report():
         print("   DEFENSE INTELLIGENCE REPORT")
         print("[DEFENSE]" * 10)
         
-        # High-threat articles
-        cursor.execute('''
-            SELECT COUNT(*) FROM articles WHERE threat_level = 'HIGH'
-        ''')
-        high_threat_count = cursor.fetchone()[0]
-        
+        # Article counts for every threat level in one pass
         cursor.execute('''
-            SELECT COUNT(*) FROM articles WHERE threat_level = 'MEDIUM'
+            SELECT threat_level, COUNT(*) FROM articles GROUP BY threat_level
         ''')
-        medium_threat_count = cursor.fetchone()[0]
-        
-        cursor.execute('''
-            SELECT COUNT(*) FROM articles WHERE threat_level = 'LOW'
-        ''')
-        low_threat_count = cursor.fetchone()[0]
+        threat_counts = dict(cursor.fetchall())
+        high_threat_count = threat_counts.get('HIGH', 0)
+        medium_threat_count = threat_counts.get('MEDIUM', 0)
+        low_threat_count = threat_counts.get('LOW', 0)
         
         print(f"\n[THREAT-SUMMARY] THREAT LEVEL SUMMARY:")
         print(f"   [HIGH] HIGH:   {high_threat_count} articles")
@@ -468,6 +621,20 @@ def generate_defense_report():
                 if indicators:
                     print(f"      [INDICATORS] Indicators: {indicators}")
         
+        # Articles per defense category
+        cursor.execute('''
+            SELECT category, COUNT(*)
+            FROM article_categories
+            GROUP BY category
+            ORDER BY COUNT(*) DESC
+        ''')
+        category_counts = cursor.fetchall()
+        
+        if category_counts:
+            print(f"\n[CATEGORIES] ARTICLES BY CATEGORY:")
+            for category, count in category_counts:
+                print(f"   {category}: {count}")
+        
         # Defense entity statistics
         cursor.execute('''
             SELECT type, COUNT(*) 
@@ -513,8 +680,10 @@ def process_all_defense_files():
         print("[X] No article JSON files found in defense_data directory.")
         return False
     
-    # Initialize database
-    init_defense_db()
+    # Initialize database once and reuse the connection for every article
+    conn = init_defense_db()
+    if not conn:
+        return False
     
     processed_count = 0
     error_count = 0
@@ -522,30 +691,40 @@ def process_all_defense_files():
     print(f"[PROCESSING] Processing {len(json_files)} defense articles...")
     print("=" * 60)
     
-    for json_file in json_files:
-        try:
-            print(f"[FILE] Processing: {json_file.name}")
-            
-            # Load article data
-            with open(json_file, 'r', encoding='utf-8') as f:
-                article_data = json.load(f)
+    def load_articles():
+        nonlocal error_count
+        for json_file in json_files:
+            try:
+                print(f"[FILE] Processing: {json_file.name}")
+                
+                # Load article data
+                article_data = load_article_json(json_file)
+            except Exception as e:
+                print(f"[ERROR] Error processing {json_file.name}: {e}")
+                error_count += 1
+                continue
             
             content = article_data.get('content', '')
             if not content or len(content) < 100:
                 print(f"[WARNING] Skipping {json_file.name}: insufficient content")
                 continue
             
-            # Analyze content
-            entities_data = extract_defense_entities(content)
-            
-            # Store in database
-            save_defense_intelligence(article_data, entities_data)
-            processed_count += 1
-            
-        except Exception as e:
-            print(f"[ERROR] Error processing {json_file.name}: {e}")
-            error_count += 1
-            continue
+            yield content, (json_file, article_data)
+    
+    # Analyze content in combined spaCy chunks, storing each article as
+    # its results come back
+    try:
+        for entities_data, (json_file, article_data) in extract_defense_entities_batch(load_articles()):
+            try:
+                if isinstance(entities_data, Exception):
+                    raise entities_data
+                save_defense_intelligence(article_data, entities_data, conn)
+                processed_count += 1
+            except Exception as e:
+                print(f"[ERROR] Error processing {json_file.name}: {e}")
+                error_count += 1
+    finally:
+        conn.close()
     
     print(f"\n[SUCCESS] Processing complete!")
     print(f"[STATS] Successfully processed: {processed_count} articles")
@@ -555,6 +734,11 @@ def process_all_defense_files():
     return processed_count > 0
     
 if __name__ == "__main__":
+    # Batch runs only surface warnings; single-article runs show the analysis
+    batch_mode = len(sys.argv) > 1 and sys.argv[1] == '--batch-process'
+    logging.basicConfig(level=logging.WARNING if batch_mode else logging.INFO,
+                        format='%(message)s')
+    
     if len(sys.argv) > 1:
         if sys.argv[1] == '--report':
             generate_defense_report()
@@ -593,8 +777,7 @@ if __name__ == "__main__":
     
     # Load and process the article
     try:
-        with open(json_file, 'r', encoding='utf-8') as f:
-            article_data = json.load(f)
+        article_data = load_article_json(json_file)
     except Exception as e:
         print(f"Error loading file: {e}")
         sys.exit(1)
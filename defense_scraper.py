@@ -6,16 +6,32 @@ Monitors multiple Indian and international defense news websites.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
 import os
+import sqlite3
 from datetime import datetime
 import concurrent.futures
 import threading
 from urllib.parse import urljoin, urlparse
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+from article_index import open_index, record_file
+from keyword_matcher import KeywordMatcher
+from page_parser import parse_html, select, select_one, node_text, node_attr
+
 # Indian Defense and Security News Sources
 INDIAN_DEFENSE_SOURCES = {
     'Indian Defence News': {
@@ -97,32 +113,172 @@ DEFENSE_KEYWORDS = [
     'nsg', 'crpf', 'bsf', 'itbp', 'cisf', 'raw', 'ib', 'drdo', 'isro'
 ]
 
+_DEFENSE_MATCHER = KeywordMatcher(DEFENSE_KEYWORDS)
+
+# Concurrent requests allowed against any single news host, and the minimum
+# gap in seconds between two requests to it
+MAX_REQUESTS_PER_DOMAIN = 3
+MIN_DOMAIN_INTERVAL = 1.0
+
+# Gateway errors worth retrying rather than dropping the article
+RETRY_STATUSES = (502, 503, 504)
+
+# Article bodies are read up to this many bytes; the text we keep sits well
+# inside it, and media-heavy pages stop costing bandwidth and parser memory
+MAX_ARTICLE_BYTES = 512 * 1024
+
+# Characters of leading paragraph text used for the early relevance check
+RELEVANCE_SNIPPET_CHARS = 500
+
+# Filename cleanup for saved articles
+_FILENAME_STRIP_RE = re.compile(r'[^\w\s-]')
+_FILENAME_SEPARATOR_RE = re.compile(r'[-\s]+')
+
+def _read_capped(chunks, max_bytes=None):
+    """Join streamed body chunks, stopping once max_bytes have been read."""
+    body = bytearray()
+    for chunk in chunks:
+        body += chunk
+        if max_bytes is not None and len(body) >= max_bytes:
+            return bytes(body[:max_bytes])
+    return bytes(body)
+
+def write_json(filepath, data):
+    """Write data as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
 class DefenseNewsScraper:
-    def __init__(self):
+    def __init__(self, db_path='defense_intelligence.db'):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        
+        # Keep connections to each news host alive across threads and retry
+        # transient gateway errors instead of dropping the article
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=RETRY_STATUSES)
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
+        # With httpx and its h2 extra installed, concurrent requests to one
+        # host share a single multiplexed HTTP/2 connection instead. The
+        # transport retries failed connections; gateway errors fall back to
+        # the requests session above, whose adapter retries them
+        self.http2_client = None
+        if httpx is not None:
+            try:
+                self.http2_client = httpx.Client(
+                    transport=httpx.HTTPTransport(
+                        http2=True,
+                        retries=2,
+                        limits=httpx.Limits(max_keepalive_connections=20, max_connections=100)
+                    ),
+                    headers=dict(self.session.headers),
+                    follow_redirects=True
+                )
+            except ImportError:
+                pass  # h2 not installed
+        
         self.scraped_articles = []
         self.lock = threading.Lock()
+        self.domain_slots = {}
+        self.last_fetch = {}
+        
+        # URLs already stored or already queued; repeats are never fetched
+        self.seen_urls = self._load_known_urls(db_path)
+    
+    @staticmethod
+    def _load_known_urls(db_path):
+        """Return the set of article URLs already in the database."""
+        if not os.path.exists(db_path):
+            return set()
+        try:
+            conn = sqlite3.connect(f'file:{db_path}?mode=ro', uri=True)
+            try:
+                return {url for (url,) in conn.execute('SELECT url FROM articles')}
+            finally:
+                conn.close()
+        except sqlite3.Error:
+            return set()
+    
+    def claim_url(self, url):
+        """Mark url as seen; return False if it was already seen."""
+        with self.lock:
+            if url in self.seen_urls:
+                return False
+            self.seen_urls.add(url)
+            return True
+    
+    def _fetch_body(self, url, timeout, max_bytes=None):
+        """GET a page politely and return its body, cut at max_bytes if given.
+        
+        Each request holds one of its host's slots and is spaced apart from
+        the previous request to that host.
+        """
+        domain = urlparse(url).netloc
+        with self.lock:
+            slot = self.domain_slots.get(domain)
+            if slot is None:
+                slot = self.domain_slots[domain] = threading.BoundedSemaphore(MAX_REQUESTS_PER_DOMAIN)
+            
+            # Reserve this host's next free start time; other hosts never wait
+            now = time.monotonic()
+            start = max(now, self.last_fetch.get(domain, 0.0) + MIN_DOMAIN_INTERVAL)
+            self.last_fetch[domain] = start
+        
+        if start > now:
+            time.sleep(start - now)
+        
+        with slot:
+            if self.http2_client is not None:
+                with self.http2_client.stream('GET', url, timeout=timeout) as response:
+                    if response.status_code not in RETRY_STATUSES:
+                        response.raise_for_status()
+                        return _read_capped(response.iter_bytes(8192), max_bytes)
+            
+            if max_bytes is None:
+                response = self.session.get(url, timeout=timeout)
+                response.raise_for_status()
+                return response.content
+            
+            with self.session.get(url, timeout=timeout, stream=True) as response:
+                response.raise_for_status()
+                return _read_capped(response.iter_content(8192), max_bytes)
+    
+    def close(self):
+        """Close the HTTP connections held by the scraper."""
+        if self.http2_client is not None:
+            self.http2_client.close()
+            self.http2_client = None
+        self.session.close()
     
     def is_defense_relevant(self, title, content):
         """Check if article is relevant to defense/security."""
         text = (title + ' ' + content).lower()
         
-        # Count defense keywords
-        keyword_count = sum(1 for keyword in DEFENSE_KEYWORDS if keyword.lower() in text)
-        
-        # High relevance if multiple keywords found
-        return keyword_count >= 2
+        # High relevance if multiple distinct keywords found; stop at the second
+        keyword_count = 0
+        for _ in _DEFENSE_MATCHER.iter_found(text):
+            keyword_count += 1
+            if keyword_count >= 2:
+                return True
+        return False
     
     def extract_article_links(self, url):
         """Extract article links from a news section page."""
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            body = self._fetch_body(url, timeout=10)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = parse_html(body)
             links = []
             
             # Common link selectors for news sites
@@ -141,10 +297,10 @@ class DefenseNewsScraper:
             ]
             
             for selector in link_selectors:
-                elements = soup.select(selector)
+                elements = select(tree, selector)
                 for element in elements:
-                    href = element.get('href')
-                    if href and isinstance(href, str):
+                    href = node_attr(element, 'href')
+                    if href:
                         full_url = urljoin(url, href)
                         if full_url not in links:
                             links.append(full_url)
@@ -158,24 +314,34 @@ class DefenseNewsScraper:
     def scrape_article_content(self, url):
         """Scrape content from a single article."""
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
+            body = self._fetch_body(url, timeout=15, max_bytes=MAX_ARTICLE_BYTES)
             
-            soup = BeautifulSoup(response.content, 'html.parser')
+            tree = parse_html(body)
             
             # Extract title
             title = ""
             title_selectors = ['h1', 'h2', '.headline', '.title', '.article-title']
             for selector in title_selectors:
-                title_element = soup.select_one(selector)
-                if title_element and title_element.get_text(strip=True):
-                    title = title_element.get_text(strip=True)
+                title_element = select_one(tree, selector)
+                title_text = node_text(title_element) if title_element else ''
+                if title_text:
+                    title = title_text
                     break
             
             if not title:
-                title_tag = soup.find('title')
+                title_tag = select_one(tree, 'title')
                 if title_tag:
-                    title = title_tag.get_text(strip=True)
+                    title = node_text(title_tag)
+            
+            # Cheap early exit: most pages fail the keyword check, so test the
+            # title and opening paragraphs before assembling the full content
+            snippet = ''
+            for paragraph in select(tree, 'p'):
+                snippet += node_text(paragraph) + ' '
+                if len(snippet) >= RELEVANCE_SNIPPET_CHARS:
+                    break
+            if not self.is_defense_relevant(title, snippet[:RELEVANCE_SNIPPET_CHARS]):
+                return None
             
             # Extract content
             content = ""
@@ -191,18 +357,18 @@ class DefenseNewsScraper:
             
             content_paragraphs = []
             for selector in content_selectors:
-                content_container = soup.select_one(selector)
+                content_container = select_one(tree, selector)
                 if content_container:
-                    paragraphs = content_container.find_all('p')
+                    paragraphs = select(content_container, 'p')
                     if paragraphs:
-                        content_paragraphs = [p.get_text(strip=True) for p in paragraphs 
-                                            if p.get_text(strip=True) and len(p.get_text(strip=True)) > 30]
+                        texts = (node_text(p) for p in paragraphs)
+                        content_paragraphs = [text for text in texts if text and len(text) > 30]
                         break
             
             if not content_paragraphs:
-                paragraphs = soup.find_all('p')
-                content_paragraphs = [p.get_text(strip=True) for p in paragraphs 
-                                    if p.get_text(strip=True) and len(p.get_text(strip=True)) > 50]
+                paragraphs = select(tree, 'p')
+                texts = (node_text(p) for p in paragraphs)
+                content_paragraphs = [text for text in texts if text and len(text) > 50]
             
             content = '\n\n'.join(content_paragraphs)
             
@@ -233,49 +399,57 @@ class DefenseNewsScraper:
             print(f"Error scraping {url}: {e}")
             return None
     
-    def scrape_source_section(self, source_name, source_config, section):
-        """Scrape articles from a specific source section."""
+    def get_section_links(self, source_name, source_config, section):
+        """Return the article links listed on a source section page."""
         section_url = urljoin(source_config['base_url'], section)
         print(f"🔍 Scanning {source_name} - {section}")
-        
+        return self.extract_article_links(section_url)
+    
+    def collect_article(self, url):
+        """Scrape one article and keep it if it is defense relevant."""
+        article = self.scrape_article_content(url)
+        if article:
+            with self.lock:
+                self.scraped_articles.append(article)
+    
+    def scrape_source_section(self, source_name, source_config, section):
+        """Scrape articles from a specific source section."""
         try:
-            # Get article links
-            links = self.extract_article_links(section_url)
-            
-            for link in links:
-                article = self.scrape_article_content(link)
-                if article:
-                    with self.lock:
-                        self.scraped_articles.append(article)
-                
-                # Be respectful with delays
-                time.sleep(1)
+            for link in self.get_section_links(source_name, source_config, section):
+                if self.claim_url(link):
+                    self.collect_article(link)
                 
         except Exception as e:
-            print(f"Error scraping section {section_url}: {e}")
+            print(f"Error scraping section {source_name} - {section}: {e}")
     
-    def scrape_defense_news(self, max_workers=3):
-        """Scrape defense news from multiple sources."""
+    def scrape_defense_news(self, max_workers=8):
+        """Scrape defense news from multiple sources.
+        
+        Section pages and articles are all scheduled on one pool so fetches
+        from different hosts overlap; per-host load is limited by
+        MAX_REQUESTS_PER_DOMAIN and MIN_DOMAIN_INTERVAL instead.
+        """
         print("🛡️ Starting Defense News Intelligence Gathering")
         print("=" * 60)
         
         all_sources = {**INDIAN_DEFENSE_SOURCES, **INTERNATIONAL_SOURCES}
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
+            section_futures = [
+                executor.submit(self.get_section_links, source_name, source_config, section)
+                for source_name, source_config in all_sources.items()
+                for section in source_config['sections']
+            ]
             
-            for source_name, source_config in all_sources.items():
-                for section in source_config['sections']:
-                    future = executor.submit(
-                        self.scrape_source_section, 
-                        source_name, 
-                        source_config, 
-                        section
-                    )
-                    futures.append(future)
+            # Queue each section's new articles as soon as its links are known
+            article_futures = []
+            for future in concurrent.futures.as_completed(section_futures):
+                for link in future.result():
+                    if self.claim_url(link):
+                        article_futures.append(executor.submit(self.collect_article, link))
             
             # Wait for all scraping to complete
-            concurrent.futures.wait(futures)
+            concurrent.futures.wait(article_futures)
         
         print(f"\n✅ Defense intelligence gathering complete!")
         print(f"📊 Total defense articles found: {len(self.scraped_articles)}")
@@ -292,11 +466,14 @@ class DefenseNewsScraper:
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
+        # Record each saved file in the sidecar index so readers don't have
+        # to re-read and re-classify it
+        index = open_index(output_dir)
+        
         for i, article in enumerate(self.scraped_articles):
             # Create clean filename
             title = article['title']
-            clean_title = re.sub(r'[^\w\s-]', '', title.lower())
-            clean_title = re.sub(r'[-\s]+', '_', clean_title)
+            clean_title = _FILENAME_SEPARATOR_RE.sub('_', _FILENAME_STRIP_RE.sub('', title.lower()))
             clean_title = clean_title[:50].strip('_')
             
             if not clean_title:
@@ -306,8 +483,8 @@ class DefenseNewsScraper:
             filepath = os.path.join(output_dir, filename)
             
             try:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(article, f, indent=2, ensure_ascii=False)
+                write_json(filepath, article)
+                record_file(index, filepath, article)
                 
                 print(f"💾 Saved: {filepath}")
                 
@@ -331,8 +508,10 @@ class DefenseNewsScraper:
         }
         
         summary_file = os.path.join(output_dir, f"defense_summary_{timestamp}.json")
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        write_json(summary_file, summary)
+        record_file(index, summary_file, summary)
+        index.commit()
+        index.close()
         
         print(f"📋 Summary saved: {summary_file}")
 
@@ -368,6 +547,8 @@ def monitor_defense_news():
         print("\n🛑 Defense monitoring stopped by user")
     except Exception as e:
         print(f"Error in monitoring: {e}")
+    finally:
+        scraper.close()
 
 if __name__ == "__main__":
     import sys
@@ -376,7 +557,10 @@ if __name__ == "__main__":
         monitor_defense_news()
     else:
         scraper = DefenseNewsScraper()
-        articles = scraper.scrape_defense_news()
+        try:
+            articles = scraper.scrape_defense_news()
+        finally:
+            scraper.close()
         
         if articles:
             scraper.save_articles()
@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+ARGUS Keyword Matcher
+Single-pass multi-keyword matching shared by the scrapers and analyzers.
+Uses a compiled Aho-Corasick automaton (pyahocorasick) when it is installed
+and falls back to plain substring scans otherwise.
+"""
+
+from collections import Counter
+
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+
+class KeywordMatcher:
+    """Find a fixed set of keywords inside already-lowercased text.
+
+    Matching is substring based, exactly like ``keyword in text``, and
+    occurrences are counted with overlaps, so both backends return the same
+    results.
+    """
+
+    def __init__(self, keywords):
+        # Lowercase and de-duplicate while keeping the caller's order
+        self.keywords = tuple(dict.fromkeys(keyword.lower() for keyword in keywords))
+        self._automaton = None
+
+        if ahocorasick is not None and self.keywords:
+            automaton = ahocorasick.Automaton()
+            for keyword in self.keywords:
+                automaton.add_word(keyword, keyword)
+            automaton.make_automaton()
+            self._automaton = automaton
+
+    def counts(self, text):
+        """Return a Counter of keyword -> number of occurrences in text."""
+        if self._automaton is not None:
+            return Counter(keyword for _, keyword in self._automaton.iter(text))
+
+        # str.count skips overlapping matches; step one character past each
+        # hit instead so counts agree with the automaton
+        counts = Counter()
+        for keyword in self.keywords:
+            count = 0
+            pos = text.find(keyword)
+            while pos != -1:
+                count += 1
+                pos = text.find(keyword, pos + 1)
+            if count:
+                counts[keyword] = count
+        return counts
+
+    def iter_found(self, text):
+        """Lazily yield each distinct keyword present in text.
+
+        Callers that only need to know whether a threshold is reached can
+        stop iterating early. Yield order is not guaranteed.
+        """
+        if self._automaton is not None:
+            seen = set()
+            for _, keyword in self._automaton.iter(text):
+                if keyword not in seen:
+                    seen.add(keyword)
+                    yield keyword
+        else:
+            for keyword in self.keywords:
+                if keyword in text:
+                    yield keyword
+
+    def found(self, text):
+        """Return the set of distinct keywords present in text."""
+        return set(self.iter_found(text))
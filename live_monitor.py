@@ -10,9 +10,53 @@ import sys
 import os
 import threading
 import sqlite3
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 import json
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:
+    Observer = None
+    FileSystemEventHandler = object
+
+from quick_data_processor import process_all_quick
+
+# Seconds without file events before a save is treated as finished
+WRITE_SETTLE_SECONDS = 1.5
+
+class NewDataHandler(FileSystemEventHandler):
+    """Flags the monitor whenever a JSON file in the data directory is written.
+    
+    Every create, write, close and rename sets the event, so the monitor can
+    wait for the events to go quiet before reading the files.
+    """
+    
+    def __init__(self, new_data_event):
+        super().__init__()
+        self.new_data_event = new_data_event
+    
+    def _flag(self, path):
+        if str(path).endswith('.json'):
+            self.new_data_event.set()
+    
+    def on_created(self, event):
+        if not event.is_directory:
+            self._flag(event.src_path)
+    
+    def on_modified(self, event):
+        if not event.is_directory:
+            self._flag(event.src_path)
+    
+    def on_closed(self, event):
+        if not event.is_directory:
+            self._flag(event.src_path)
+    
+    def on_moved(self, event):
+        if not event.is_directory:
+            self._flag(event.dest_path)
 
 class LiveDefenseMonitor:
     def __init__(self):
@@ -20,9 +64,62 @@ class LiveDefenseMonitor:
         self.scraper_process = None
         self.last_data_check = datetime.now()
         self.data_dir = Path('defense_data')
+        self.observer = None
+        self.new_data_event = threading.Event()
+        self.data_pending = False
+        self.pool = None
+    
+    def start_watching(self):
+        """Watch the data directory for new files when watchdog is installed."""
+        if Observer is None:
+            print("ℹ️ watchdog not installed - polling for new data every minute")
+            return False
+        
+        try:
+            self.data_dir.mkdir(exist_ok=True)
+            self.observer = Observer()
+            self.observer.schedule(NewDataHandler(self.new_data_event), str(self.data_dir))
+            self.observer.start()
+            print("👁️ Watching for new defense data files")
+            return True
+        except Exception as e:
+            print(f"⚠️ File watching unavailable, polling instead: {e}")
+            self.observer = None
+            return False
+    
+    def stop_watching(self):
+        """Stop the file watcher."""
+        if self.observer:
+            self.observer.stop()
+            self.observer.join(timeout=5)
+            self.observer = None
+    
+    def wait_for_next_cycle(self, timeout=60):
+        """Sleep until the next cycle, waking early once watched files settle."""
+        if not self.observer:
+            time.sleep(timeout)
+            return
+        
+        if not self.new_data_event.wait(timeout):
+            return
+        
+        # The scraper writes a batch of files per save; wait until the
+        # events stop so none of them is read half-written
+        self.data_pending = True
+        while True:
+            self.new_data_event.clear()
+            if not self.new_data_event.wait(WRITE_SETTLE_SECONDS):
+                break
         
     def check_new_data_files(self):
         """Check for new JSON files that need processing."""
+        if self.observer:
+            # Notified by the watcher; no directory scan needed
+            if self.data_pending:
+                self.data_pending = False
+                return True
+            return False
+        
         if not self.data_dir.exists():
             return False
             
@@ -40,21 +137,26 @@ class LiveDefenseMonitor:
         """Process new defense data files."""
         try:
             print("📊 Processing new defense intelligence data...")
-            result = subprocess.run([
-                sys.executable, 
-                'defense_intelligence.py'
-            ], capture_output=True, text=True, cwd=os.path.dirname(__file__))
             
-            if result.returncode == 0:
+            # Runs in-process with one worker pool kept across cycles, so
+            # there is no interpreter start-up or re-import per cycle. Workers
+            # only start once a run is large enough to use the pool
+            if self.pool is None:
+                self.pool = ProcessPoolExecutor()
+            if process_all_quick(pool=self.pool):
                 print("✅ Data processing completed successfully")
-                self.last_data_check = datetime.now()
-                return True
             else:
-                print(f"❌ Data processing failed: {result.stderr}")
-                return False
+                print("📡 No new articles stored")
+            self.last_data_check = datetime.now()
+            return True
                 
         except Exception as e:
             print(f"❌ Error processing data: {e}")
+            # A broken pool (e.g. a killed worker) never recovers, so
+            # drop it and let the next cycle start a fresh one
+            if self.pool:
+                self.pool.shutdown(cancel_futures=True)
+                self.pool = None
             return False
     
     def start_scraper(self):
@@ -110,11 +212,14 @@ class LiveDefenseMonitor:
             """)
             threat_dist = dict(cursor.fetchall())
             
-            # Get recent articles (last hour)
+            # Get recent articles (last hour). Timestamps are stored as local
+            # ISO strings, so comparing against a cutoff in the same format
+            # uses the scraped_timestamp index instead of a datetime() scan
+            cutoff = (datetime.now() - timedelta(hours=1)).isoformat()
             cursor.execute("""
                 SELECT COUNT(*) FROM articles 
-                WHERE datetime(scraped_timestamp) >= datetime('now', '-1 hour')
-            """)
+                WHERE scraped_timestamp >= ?
+            """, (cutoff,))
             recent_articles = cursor.fetchone()[0]
             
             conn.close()
@@ -138,6 +243,7 @@ class LiveDefenseMonitor:
         if not self.start_scraper():
             return False
         
+        self.start_watching()
         self.is_running = True
         cycle_count = 0
         
@@ -170,8 +276,8 @@ class LiveDefenseMonitor:
                               f"MEDIUM={threat_dist.get('MEDIUM', 0)} " +
                               f"LOW={threat_dist.get('LOW', 0)}")
                 
-                print(f"💤 Waiting 60 seconds until next check...")
-                time.sleep(60)  # Check every minute
+                print(f"💤 Waiting up to 60 seconds until next check...")
+                self.wait_for_next_cycle(60)  # Check every minute, or on new files
                 
         except KeyboardInterrupt:
             print("\n🛑 Monitor stopped by user")
@@ -183,7 +289,11 @@ class LiveDefenseMonitor:
     def stop(self):
         """Stop the monitoring system."""
         self.is_running = False
+        self.stop_watching()
         self.stop_scraper()
+        if self.pool:
+            self.pool.shutdown(cancel_futures=True)
+            self.pool = None
         print("👋 Live monitoring system stopped")
 
 def main():
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+ARGUS Page Parser
+Small HTML parsing layer shared by the scrapers.
+Uses selectolax's lexbor backend (a C parser) when it is installed and falls
+back to BeautifulSoup (with lxml when available) otherwise, behind the same
+handful of helpers.
+"""
+
+import re
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+if LexborHTMLParser is None:
+    import soupsieve
+    from bs4 import BeautifulSoup
+    
+    # The C-based lxml tree builder is several times faster than html.parser
+    try:
+        import lxml  # noqa: F401
+        _BS4_PARSER = 'lxml'
+    except ImportError:
+        _BS4_PARSER = 'html.parser'
+
+# Blocks the scrapers never read from. Dropping them before parsing keeps
+# inline JSON blobs, CSS and icon markup out of the tree entirely.
+_SKIPPED_BLOCKS = r'<(script|style|svg)\b[^>]*>.*?</\1\s*>'
+_SKIPPED_BLOCKS_RE = re.compile(_SKIPPED_BLOCKS, re.IGNORECASE | re.DOTALL)
+_SKIPPED_BLOCKS_BYTES_RE = re.compile(_SKIPPED_BLOCKS.encode(), re.IGNORECASE | re.DOTALL)
+
+
+def parse_html(content):
+    """Parse raw HTML (bytes or str) into a tree for the helpers below."""
+    if isinstance(content, bytes):
+        content = _SKIPPED_BLOCKS_BYTES_RE.sub(b'', content)
+    else:
+        content = _SKIPPED_BLOCKS_RE.sub('', content)
+    
+    if LexborHTMLParser is not None:
+        return LexborHTMLParser(content)
+    return BeautifulSoup(content, _BS4_PARSER)
+
+
+# BeautifulSoup fallback: bare tag names and single classes go straight to
+# find()/find_all(); anything else is compiled by soupsieve once and reused
+_SIMPLE_SELECTOR_RE = re.compile(r'^(?:([a-zA-Z][\w-]*)|\.([\w-]+))$')
+_compiled_selectors = {}
+
+
+def _bs4_select(node, selector, first):
+    match = _SIMPLE_SELECTOR_RE.match(selector)
+    if match:
+        tag_name, class_name = match.groups()
+        if class_name:
+            return node.find(class_=class_name) if first else node.find_all(class_=class_name)
+        return node.find(tag_name) if first else node.find_all(tag_name)
+    
+    compiled = _compiled_selectors.get(selector)
+    if compiled is None:
+        compiled = _compiled_selectors[selector] = soupsieve.compile(selector)
+    return compiled.select_one(node) if first else compiled.select(node)
+
+
+def select(node, selector):
+    """Return every element under node matching a CSS selector."""
+    if LexborHTMLParser is not None:
+        return node.css(selector)
+    return _bs4_select(node, selector, first=False)
+
+
+def select_one(node, selector):
+    """Return the first element under node matching a CSS selector, or None."""
+    if LexborHTMLParser is not None:
+        return node.css_first(selector)
+    return _bs4_select(node, selector, first=True)
+
+
+def node_text(node):
+    """Return the element's text with each text piece stripped."""
+    if LexborHTMLParser is not None:
+        return node.text(strip=True)
+    return node.get_text(strip=True)
+
+
+def node_attr(node, name):
+    """Return an attribute value, or None when it is missing."""
+    if LexborHTMLParser is not None:
+        return node.attributes.get(name)
+    value = node.get(name)
+    return value if isinstance(value, str) else None
@@ -7,16 +7,65 @@ Processes JSON files directly into database without heavy NLP requirements.
 import json
 import sqlite3
 import os
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from keyword_matcher import KeywordMatcher
+
+# Defense keywords for quick analysis
+QUICK_DEFENSE_KEYWORDS = {
+    'military': ['military', 'army', 'navy', 'defense', 'soldier', 'combat', 'operation'],
+    'weapons': ['weapon', 'missile', 'bomb', 'gun', 'aircraft', 'drone'],
+    'security': ['security', 'threat', 'attack', 'terrorism', 'alert', 'surveillance'],
+    'cyber': ['cyber', 'hacking', 'malware', 'breach', 'ransomware']
+}
+
+HIGH_THREAT_WORDS = ['attack', 'threat', 'terrorism', 'bomb', 'missile', 'alert', 'emergency']
+
+# Every keyword above, found in one pass over the text
+_QUICK_MATCHER = KeywordMatcher(
+    [keyword for keywords in QUICK_DEFENSE_KEYWORDS.values() for keyword in keywords]
+    + HIGH_THREAT_WORDS
+)
+
+# Existing URLs are skipped by the UNIQUE constraint rather than an exception
+_SQL_INSERT_ARTICLE = '''
+    INSERT OR IGNORE INTO articles (title, content, url, scraped_timestamp,
+                                  content_length, word_count, threat_level,
+                                  relevance_score, detected_categories, key_indicators)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_CATEGORY = '''
+    INSERT OR IGNORE INTO article_categories (article_id, category)
+    VALUES (?, ?)
+'''
+
+# Articles written per executemany/commit during batch processing
+INSERT_BATCH_SIZE = 500
+
+# Below this many files, worker start-up costs more than the analysis saves
+POOL_MIN_FILES = 200
+
 def init_defense_db():
     """Initialize defense database."""
     try:
         conn = sqlite3.connect('defense_intelligence.db')
         cursor = conn.cursor()
         
+        # WAL with NORMAL sync keeps bulk loads from fsyncing every commit
+        cursor.execute('PRAGMA journal_mode = WAL')
+        cursor.execute('PRAGMA synchronous = NORMAL')
+        cursor.execute('PRAGMA temp_store = MEMORY')
+        cursor.execute('PRAGMA cache_size = -65536')
+        
         # Enhanced articles table
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS articles (
@@ -34,6 +83,23 @@ def init_defense_db():
             )
         ''')
         
+        # Threat counts and recent-article windows are answered from indexes
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_threat_level ON articles (threat_level)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_scraped ON articles (scraped_timestamp)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_articles_scraped_date ON articles (date(scraped_timestamp))')
+        
+        # Same per-category table defense_intelligence reports from
+        cursor.execute('''
+            CREATE TABLE IF NOT EXISTS article_categories (
+                article_id INTEGER NOT NULL,
+                category TEXT NOT NULL,
+                PRIMARY KEY (article_id, category),
+                FOREIGN KEY (article_id) REFERENCES articles (id)
+            )
+        ''')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_ac_cat ON article_categories (category)')
+        backfill_article_categories(cursor)
+        
         conn.commit()
         print("✓ Defense intelligence database initialized successfully")
         return conn
@@ -42,6 +108,27 @@ def init_defense_db():
         print(f"✗ Database initialization error: {e}")
         return None
 
+def category_rows(article_rows):
+    """Split (article_id, detected_categories) pairs into article_categories rows."""
+    return [
+        (article_id, category)
+        for article_id, categories in article_rows
+        for category in (categories or '').split(',') if category
+    ]
+
+def backfill_article_categories(cursor):
+    """Add article_categories rows for articles that have none yet.
+    
+    Covers articles saved before the table existed or by older writers;
+    cheap when nothing is missing, so it runs on every init.
+    """
+    cursor.execute('''
+        SELECT id, detected_categories FROM articles
+        WHERE detected_categories IS NOT NULL AND detected_categories != ''
+          AND NOT EXISTS (SELECT 1 FROM article_categories WHERE article_id = articles.id)
+    ''')
+    cursor.executemany(_SQL_INSERT_CATEGORY, category_rows(cursor.fetchall()))
+
 def analyze_text_simple(text):
     """Simple text analysis without NLP requirements.""" 
     if not text:
@@ -52,35 +139,21 @@ def analyze_text_simple(text):
             'key_indicators': []
         }
     
-    text_lower = text.lower()
-    
-    # Defense keywords for quick analysis
-    defense_keywords = {
-        'military': ['military', 'army', 'navy', 'defense', 'soldier', 'combat', 'operation'],
-        'weapons': ['weapon', 'missile', 'bomb', 'gun', 'aircraft', 'drone'],
-        'security': ['security', 'threat', 'attack', 'terrorism', 'alert', 'surveillance'],
-        'cyber': ['cyber', 'hacking', 'malware', 'breach', 'ransomware']
-    }
-    
-    high_threat_words = ['attack', 'threat', 'terrorism', 'bomb', 'missile', 'alert', 'emergency']
+    found = _QUICK_MATCHER.found(text.lower())
     
     detected_categories = []
     relevance_score = 0
-    key_indicators = []
     
     # Check categories
-    for category, keywords in defense_keywords.items():
-        for keyword in keywords:
-            if keyword in text_lower:
-                if category not in detected_categories:
-                    detected_categories.append(category)
-                relevance_score += 5
+    for category, keywords in QUICK_DEFENSE_KEYWORDS.items():
+        hits = sum(1 for keyword in keywords if keyword in found)
+        if hits:
+            detected_categories.append(category)
+            relevance_score += 5 * hits
     
     # Check for high threat indicators
-    for threat_word in high_threat_words:
-        if threat_word in text_lower:
-            key_indicators.append(threat_word)
-            relevance_score += 10
+    key_indicators = [word for word in HIGH_THREAT_WORDS if word in found]
+    relevance_score += 10 * len(key_indicators)
     
     # Determine threat level
     threat_level = 'LOW'
@@ -96,59 +169,113 @@ def analyze_text_simple(text):
         'key_indicators': key_indicators
     }
 
-def process_article_quick(article_data):
-    """Quickly process article data."""
+def build_article_row(article_data):
+    """Analyze an article and return its row for the articles table."""
     content = article_data.get('content', '')
     analysis = analyze_text_simple(content)
     
+    # Prepare data
+    title = article_data.get('title', 'Untitled')
+    url = article_data.get('url', '')
+    scraped_timestamp = article_data.get('scraped_timestamp', datetime.now().isoformat())
+    content_length = len(content)
+    word_count = len(content.split()) if content else 0
+    
+    # Analysis data
+    threat_level = analysis['threat_level']
+    relevance_score = analysis['relevance_score']
+    detected_categories = ','.join(analysis['detected_categories'])
+    key_indicators = ','.join(analysis['key_indicators'])
+    
+    return (title, content, url, scraped_timestamp, content_length, word_count,
+            threat_level, relevance_score, detected_categories, key_indicators)
+
+def process_article_quick(article_data, cursor=None):
+    """Quickly process article data.
+    
+    Pass a ``cursor`` from an open connection to reuse it across articles;
+    otherwise a connection is opened and closed here.
+    """
+    row = build_article_row(article_data)
+    
     # Save to database
-    conn = init_defense_db()
-    if not conn:
-        return None
+    conn = None
+    if cursor is None:
+        conn = init_defense_db()
+        if not conn:
+            return None
+        cursor = conn.cursor()
     
     try:
-        cursor = conn.cursor()
+        cursor.execute(_SQL_INSERT_ARTICLE, row)
         
-        # Prepare data
-        title = article_data.get('title', 'Untitled')
-        url = article_data.get('url', '')
-        scraped_timestamp = article_data.get('scraped_timestamp', datetime.now().isoformat())
-        content_length = len(content)
-        word_count = len(content.split()) if content else 0
-        
-        # Analysis data
-        threat_level = analysis['threat_level']
-        relevance_score = analysis['relevance_score']
-        detected_categories = ','.join(analysis['detected_categories'])
-        key_indicators = ','.join(analysis['key_indicators'])
-        
-        # Insert article
-        try:
-            cursor.execute('''
-                INSERT INTO articles (title, content, url, scraped_timestamp, 
-                                    content_length, word_count, threat_level, 
-                                    relevance_score, detected_categories, key_indicators)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            ''', (title, content, url, scraped_timestamp, content_length, word_count,
-                  threat_level, relevance_score, detected_categories, key_indicators))
-            
-            article_id = cursor.lastrowid
-            conn.commit()
-            return article_id
-            
-        except sqlite3.IntegrityError:
-            # Article already exists, skip
-            return None
+        # Nothing inserted means the article already exists
+        article_id = cursor.lastrowid if cursor.rowcount == 1 else None
+        if article_id is not None:
+            cursor.executemany(_SQL_INSERT_CATEGORY, category_rows([(article_id, row[8])]))
+        cursor.connection.commit()
+        return article_id
             
     except sqlite3.Error as e:
         print(f"✗ Database error: {e}")
         return None
         
     finally:
-        conn.close()
+        if conn is not None:
+            conn.close()
 
-def process_all_quick():
-    """Quickly process all JSON files."""
+def _insert_batch(conn, rows):
+    """Insert a batch of article rows in one transaction; return rows added."""
+    try:
+        # AUTOINCREMENT ids only grow, so this batch's articles are the ones above it
+        last_id = conn.execute('SELECT COALESCE(MAX(id), 0) FROM articles').fetchone()[0]
+        before = conn.total_changes
+        conn.executemany(_SQL_INSERT_ARTICLE, rows)
+        inserted = conn.total_changes - before
+        
+        new_articles = conn.execute(
+            'SELECT id, detected_categories FROM articles WHERE id > ?', (last_id,)
+        ).fetchall()
+        conn.executemany(_SQL_INSERT_CATEGORY, category_rows(new_articles))
+        conn.commit()
+    except sqlite3.Error as e:
+        print(f"✗ Database error: {e}")
+        conn.rollback()
+        return 0
+    return inserted
+
+def _analyze_file(json_file):
+    """Load and analyze one JSON file (in a worker process for large runs).
+    
+    Returns ('row', row), ('skip', None) or ('error', message) so the parent
+    stays the only process writing to SQLite.
+    """
+    try:
+        if orjson is not None:
+            with open(json_file, 'rb') as f:
+                article_data = orjson.loads(f.read())
+        else:
+            with open(json_file, 'r', encoding='utf-8') as f:
+                article_data = json.load(f)
+        
+        content = article_data.get('content', '')
+        if not content or len(content) < 50:
+            return 'skip', None
+        
+        return 'row', build_article_row(article_data)
+        
+    except Exception as e:
+        return 'error', str(e)
+
+def process_all_quick(pool=None):
+    """Quickly process all JSON files.
+    
+    Args:
+        pool: Optional ProcessPoolExecutor to analyze with. Long-running
+            callers pass one they keep, so repeated runs don't start new
+            worker processes; it is left running afterwards. Runs below
+            POOL_MIN_FILES ignore it and analyze in-process.
+    """
     defense_dir = Path("defense_data")
     
     if not defense_dir.exists():
@@ -156,41 +283,70 @@ def process_all_quick():
         return False
     
     # Get all JSON files except summaries
-    json_files = [f for f in defense_dir.glob("*.json") if 'summary' not in f.name]
+    # scandir yields names without building a Path per entry
+    with os.scandir(defense_dir) as entries:
+        json_files = [entry.path for entry in entries
+                      if entry.name.endswith('.json') and 'summary' not in entry.name
+                      and entry.is_file()]
     
     if not json_files:
         print("[ERROR] No article JSON files found.")
         return False
     
+    # One connection (and schema check) for the whole run
+    conn = init_defense_db()
+    if not conn:
+        return False
+    
     processed_count = 0
     skipped_count = 0
+    rows = []
     
     print(f"[PROCESSING] Quick processing {len(json_files)} defense articles...")
     print("=" * 60)
     
-    for i, json_file in enumerate(json_files):
-        if i % 100 == 0:
-            print(f"[PROGRESS] Progress: {i}/{len(json_files)} files processed")
+    # Large runs analyze across all cores; small ones stay in-process,
+    # even when the caller supplied a pool. Either way this process
+    # batches the inserts
+    own_pool = None
+    try:
+        if len(json_files) < POOL_MIN_FILES:
+            pool = None
+        elif pool is None:
+            pool = own_pool = ProcessPoolExecutor()
         
-        try:
-            with open(json_file, 'r', encoding='utf-8') as f:
-                article_data = json.load(f)
+        if pool is not None:
+            results = pool.map(_analyze_file, json_files, chunksize=64)
+        else:
+            results = map(_analyze_file, json_files)
+        
+        for i, (json_file, (status, payload)) in enumerate(zip(json_files, results)):
+            if i % 100 == 0:
+                print(f"[PROGRESS] Progress: {i}/{len(json_files)} files processed")
             
-            content = article_data.get('content', '')
-            if not content or len(content) < 50:
+            if status == 'error':
+                print(f"[ERROR] Error processing {os.path.basename(json_file)}: {payload}")
                 skipped_count += 1
                 continue
-            
-            article_id = process_article_quick(article_data)
-            if article_id:
-                processed_count += 1
-            else:
+            if status == 'skip':
                 skipped_count += 1
-                
-        except Exception as e:
-            print(f"[ERROR] Error processing {json_file.name}: {e}")
-            skipped_count += 1
-            continue
+                continue
+            
+            rows.append(payload)
+            if len(rows) >= INSERT_BATCH_SIZE:
+                inserted = _insert_batch(conn, rows)
+                processed_count += inserted
+                skipped_count += len(rows) - inserted
+                rows.clear()
+        
+        if rows:
+            inserted = _insert_batch(conn, rows)
+            processed_count += inserted
+            skipped_count += len(rows) - inserted
+    finally:
+        if own_pool is not None:
+            own_pool.shutdown()
+        conn.close()
     
     print(f"\n[SUCCESS] Quick processing complete!")
     print(f"[STATS] Successfully processed: {processed_count} articles")
@@ -198,27 +354,32 @@ def process_all_quick():
     
     # Show database stats
     conn = sqlite3.connect('defense_intelligence.db')
-    cursor = conn.cursor()
-    
-    cursor.execute("SELECT COUNT(*) FROM articles")
-    total_articles = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM articles WHERE threat_level = 'HIGH'")
-    high_threats = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM articles WHERE threat_level = 'MEDIUM'") 
-    medium_threats = cursor.fetchone()[0]
-    
-    cursor.execute("SELECT COUNT(*) FROM articles WHERE datetime(scraped_timestamp) >= datetime('now', '-24 hours')")
-    recent_articles = cursor.fetchone()[0]
-    
-    print(f"\n[DATABASE] DATABASE SUMMARY:")
-    print(f"   [ARTICLES] Total articles: {total_articles}")
-    print(f"   [HIGH] High threats: {high_threats}")
-    print(f"   [MEDIUM] Medium threats: {medium_threats}")
-    print(f"   [RECENT] Last 24 hours: {recent_articles}")
+    try:
+        cursor = conn.cursor()
+        
+        cursor.execute("SELECT COUNT(*) FROM articles")
+        total_articles = cursor.fetchone()[0]
+        
+        cursor.execute("SELECT COUNT(*) FROM articles WHERE threat_level = 'HIGH'")
+        high_threats = cursor.fetchone()[0]
+        
+        cursor.execute("SELECT COUNT(*) FROM articles WHERE threat_level = 'MEDIUM'") 
+        medium_threats = cursor.fetchone()[0]
+        
+        # Timestamps are stored as local ISO strings, so a plain string comparison
+        # against a cutoff in the same format can use the timestamp index
+        cutoff = (datetime.now() - timedelta(hours=24)).isoformat()
+        cursor.execute("SELECT COUNT(*) FROM articles WHERE scraped_timestamp >= ?", (cutoff,))
+        recent_articles = cursor.fetchone()[0]
+        
+        print(f"\n[DATABASE] DATABASE SUMMARY:")
+        print(f"   [ARTICLES] Total articles: {total_articles}")
+        print(f"   [HIGH] High threats: {high_threats}")
+        print(f"   [MEDIUM] Medium threats: {medium_threats}")
+        print(f"   [RECENT] Last 24 hours: {recent_articles}")
+    finally:
+        conn.close()
     
-    conn.close()
     return processed_count > 0
 
 if __name__ == "__main__":
@@ -7,7 +7,10 @@ Easy one-click setup for users.
 import os
 import sys
 import subprocess
+import hashlib
 import platform
+import shutil
+import concurrent.futures
 from pathlib import Path
 
 def print_banner():
@@ -35,13 +38,39 @@ def create_virtual_environment():
     
     try:
         print("🔧 Creating virtual environment...")
-        subprocess.run([sys.executable, "-m", "venv", ".venv"], check=True)
+        subprocess.run([sys.executable, "-m", "venv", ".venv"], check=True, close_fds=False)
         print("✅ Virtual environment created successfully")
         return True
     except subprocess.CalledProcessError:
         print("❌ Failed to create virtual environment")
         return False
 
+# Child processes are started with close_fds=False: setup holds no file
+# descriptors worth hiding, and it lets CPython spawn them via posix_spawn
+# (vfork) instead of fork+exec
+
+# Every pip install prefers prebuilt wheels and shares a cache inside the
+# project, so re-running setup reuses wheels instead of downloading or
+# compiling them again
+PIP_CACHE_DIR = ".pip-cache"
+PIP_INSTALL_OPTIONS = ["--prefer-binary", "--cache-dir", PIP_CACHE_DIR]
+
+CORE_REQUIREMENTS = [
+    "requests>=2.31.0",
+    "beautifulsoup4>=4.12.0", 
+    "streamlit>=1.28.0",
+    "pandas>=2.0.0",
+    "plotly>=5.15.0"
+]
+
+# Written after a successful core install; while it matches the current
+# requirement list, re-running setup skips the install entirely
+INSTALLED_HASH_FILE = Path(".venv") / ".installed-hash"
+
+def requirements_hash():
+    """Hash the core requirement list so changes to it trigger a reinstall."""
+    return hashlib.sha256("\n".join(CORE_REQUIREMENTS).encode()).hexdigest()
+
 def get_pip_command():
     """Get the correct pip command for the platform."""
     if platform.system() == "Windows":
@@ -49,44 +78,71 @@ def get_pip_command():
     else:
         return [".venv/bin/python", "-m", "pip"]
 
+# en_core_web_sm release wheel; 3.7.x models pin spaCy to the 3.7 series
+SPACY_MODEL_URL = ("https://github.com/explosion/spacy-models/releases/download/"
+                   "en_core_web_sm-3.7.1/en_core_web_sm-3.7.1-py3-none-any.whl")
+
+# pip versions at or above this floor are new enough; older ones get upgraded
+MIN_PIP = "23.1"
+
+def pip_needs_upgrade():
+    """Return True when the venv's pip is older than MIN_PIP (or unreadable)."""
+    result = subprocess.run(get_pip_command() + ["--version"], capture_output=True,
+                            text=True, close_fds=False)
+    # Output looks like "pip 23.3.1 from /path/to/pip (python 3.11)"
+    parts = result.stdout.split()
+    if result.returncode != 0 or len(parts) < 2:
+        return True
+    
+    def version_tuple(version):
+        return tuple(int(part) for part in version.split(".") if part.isdigit())
+    
+    return version_tuple(parts[1]) < version_tuple(MIN_PIP)
+
+def get_install_command(uv=None):
+    """Get the package install command, using uv when its path is given.
+    
+    uv resolves and installs wheels in parallel from its own global cache,
+    which is much faster than pip on a cold venv.
+    """
+    if uv:
+        return [uv, "pip", "install", "--python", get_pip_command()[0]]
+    return get_pip_command() + ["install", *PIP_INSTALL_OPTIONS]
+
 def install_dependencies():
     """Install required dependencies."""
     try:
         print("📦 Installing dependencies...")
-        pip_cmd = get_pip_command()
+        uv = shutil.which("uv")
+        install_cmd = get_install_command(uv)
         
-        # Upgrade pip first
-        subprocess.run(pip_cmd + ["install", "--upgrade", "pip"], check=True)
-        
-        # Install core requirements
-        core_requirements = [
-            "requests>=2.31.0",
-            "beautifulsoup4>=4.12.0", 
-            "streamlit>=1.28.0",
-            "pandas>=2.0.0",
-            "plotly>=5.15.0"
-        ]
-        
-        for req in core_requirements:
-            print(f"   Installing {req}...")
-            subprocess.run(pip_cmd + ["install", req], check=True)
-        
-        print("✅ Core dependencies installed successfully")
+        current_hash = requirements_hash()
+        if INSTALLED_HASH_FILE.exists() and INSTALLED_HASH_FILE.read_text().strip() == current_hash:
+            print("✅ Core dependencies already installed (requirements unchanged)")
+        else:
+            if uv:
+                print("   Using uv for package installation")
+            elif pip_needs_upgrade():
+                # Upgrade pip first, with wheel and setuptools so any sdist-only
+                # dependency is built once and cached as a wheel
+                subprocess.run(install_cmd + ["--upgrade", "pip", "wheel", "setuptools"], check=True, close_fds=False)
+            
+            # One install run resolves and installs everything together instead
+            # of starting pip (and its resolver) once per package
+            print(f"   Installing {', '.join(CORE_REQUIREMENTS)}...")
+            subprocess.run(install_cmd + CORE_REQUIREMENTS, check=True, close_fds=False)
+            INSTALLED_HASH_FILE.write_text(current_hash + "\n")
+            
+            print("✅ Core dependencies installed successfully")
         
         # Optional: Install NLP dependencies
         response = input("\n🤔 Install advanced NLP features? (requires ~2GB download) [y/N]: ")
         if response.lower() in ['y', 'yes']:
-            print("📥 Installing NLP dependencies...")
-            subprocess.run(pip_cmd + ["install", "spacy>=3.7.0"], check=True)
-            
-            # Download spaCy model
-            print("📥 Downloading English language model...")
-            if platform.system() == "Windows":
-                python_cmd = [".venv/Scripts/python.exe"]
-            else:
-                python_cmd = [".venv/bin/python"]
-            
-            subprocess.run(python_cmd + ["-m", "spacy", "download", "en_core_web_sm"], check=True)
+            # spaCy and its English model go in one install run; the model
+            # comes from its release wheel URL, so no 'spacy download'
+            # process or releases API lookup is needed
+            print("📥 Installing NLP dependencies and English language model...")
+            subprocess.run(install_cmd + ["spacy>=3.7.0", SPACY_MODEL_URL], check=True, close_fds=False)
             print("✅ NLP features installed successfully")
         
         return True
@@ -95,16 +151,20 @@ def install_dependencies():
         print(f"❌ Failed to install dependencies: {e}")
         return False
 
-def setup_directories():
-    """Setup required directories."""
+def setup_directories(report=print):
+    """Setup required directories.
+    
+    Args:
+        report: Called with each status message (print by default)
+    """
     try:
-        print("📁 Setting up directories...")
+        report("📁 Setting up directories...")
         Path("defense_data").mkdir(exist_ok=True)
         Path("logs").mkdir(exist_ok=True)
-        print("✅ Directories created successfully")
+        report("✅ Directories created successfully")
         return True
     except Exception as e:
-        print(f"❌ Failed to create directories: {e}")
+        report(f"❌ Failed to create directories: {e}")
         return False
 
 def test_installation():
@@ -118,19 +178,32 @@ def test_installation():
         else:
             python_cmd = [".venv/bin/python"]
         
+        # Every check runs inside one probe process: one interpreter start
+        # reports all imports and versions
         test_code = '''
-import requests
-import streamlit
-import pandas
-import plotly
+import importlib
+failed = []
+for module, optional in [("requests", False), ("bs4", False), ("streamlit", False),
+                         ("pandas", False), ("plotly", False), ("spacy", True)]:
+    try:
+        version = getattr(importlib.import_module(module), "__version__", "unknown")
+        print(f"   ✅ {module} {version}")
+    except ImportError:
+        print(f"   {'⚪' if optional else '❌'} {module} not installed")
+        if not optional:
+            failed.append(module)
+if failed:
+    raise SystemExit("Missing core modules: " + ", ".join(failed))
 print("✅ All core modules imported successfully")
 '''
         
         result = subprocess.run(
             python_cmd + ["-c", test_code], 
             capture_output=True, 
-            text=True
+            text=True,
+            close_fds=False
         )
+        print(result.stdout, end="")
         
         if result.returncode == 0:
             print("✅ Installation test passed")
@@ -170,6 +243,8 @@ def show_usage_instructions():
     print("• Check logs in 'logs/' directory for troubleshooting")
     print("• Ensure Python 3.8+ is installed")
     print("• All data is stored locally in 'defense_data/' directory")
+    print(f"• Downloaded and built packages are cached in '{PIP_CACHE_DIR}/' so re-running setup is fast;")
+    print("  delete that directory to force fresh downloads")
 
 def main():
     """Main setup function."""
@@ -182,10 +257,20 @@ def main():
     if not create_virtual_environment():
         sys.exit(1)
     
-    if not install_dependencies():
-        sys.exit(1)
+    # Directory setup doesn't need the venv or any package, so it runs in the
+    # background while the (much slower) dependency install and its prompt
+    # run here on the main thread. Its messages are held until the install
+    # is done so they can't land in the middle of the prompt
+    directory_messages = []
+    with concurrent.futures.ThreadPoolExecutor(max_workers=1) as executor:
+        directories_future = executor.submit(setup_directories, directory_messages.append)
+        dependencies_ok = install_dependencies()
+        directories_ok = directories_future.result()
+    
+    for message in directory_messages:
+        print(message)
     
-    if not setup_directories():
+    if not dependencies_ok or not directories_ok:
         sys.exit(1)
     
     if not test_installation():
@@ -11,10 +11,14 @@ from pathlib import Path
 
 def create_virtual_environment():
     """Create a Python virtual environment in the project root."""
+    if Path(".venv").exists():
+        print("✓ Reusing existing virtual environment at .venv/")
+        return True
+    
     print("Creating Python virtual environment...")
     try:
         # Create virtual environment
-        subprocess.run([sys.executable, "-m", "venv", ".venv"], check=True)
+        subprocess.run([sys.executable, "-m", "venv", ".venv"], check=True, close_fds=False)
         print("✓ Virtual environment created successfully at .venv/")
         return True
     except subprocess.CalledProcessError as e:
@@ -4,13 +4,50 @@ ARGUS Defense Data Summary Generator
 Simple script to view all collected defense intelligence data.
 """
 
-import json
 import os
 from pathlib import Path
 from datetime import datetime
 
+import pandas as pd
+
+from article_index import sync_index, load_json
+
+# How many articles of each priority are listed in full
+TOP_HIGH_PRIORITY = 10
+TOP_MEDIUM_PRIORITY = 5
+
+SUMMARY_FIELDS = ('total_articles', 'scraping_timestamp', 'sources_scraped')
+
+def summarize_article(article):
+    """Keep only the fields the report prints, with a short content preview."""
+    content = article.get('content', '')
+    return {
+        'title': article.get('title', 'Untitled'),
+        'source_domain': article.get('source_domain', 'Unknown Source'),
+        'url': article.get('url', '#'),
+        'word_count': article.get('word_count', 0),
+        'scraped_timestamp': article.get('scraped_timestamp', ''),
+        'preview': content[:200] + "..." if len(content) > 200 else content
+    }
+
+def load_indexed(defense_data_dir, names, summarize):
+    """Load just the listed files, skipping any removed since indexing."""
+    loaded = []
+    for name in names:
+        file_path = Path(defense_data_dir) / name
+        try:
+            loaded.append(summarize(load_json(file_path)))
+        except Exception as e:
+            print(f"Warning: Error loading {file_path}: {e}")
+    return loaded
+
 def load_and_display_defense_data():
-    """Load and display all defense data in a simple format."""
+    """Load and display all defense data in a simple format.
+    
+    Priorities and sizes come from the defense_data/index.sqlite sidecar,
+    which only re-reads new or changed files; the article JSON is opened
+    just for the handful of articles printed in full.
+    """
     defense_data_dir = "defense_data"
     
     if not os.path.exists(defense_data_dir):
@@ -21,24 +58,43 @@ def load_and_display_defense_data():
     print("🛡️ ARGUS Defense Intelligence Data Summary")
     print("=" * 60)
     
-    articles = []
-    summary_data = None
+    conn = sync_index(defense_data_dir)
     
-    # Load all JSON files
-    for file_path in Path(defense_data_dir).glob("*.json"):
-        try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                
-                # Check if it's a summary file
-                if 'total_articles' in data and 'articles' in data:
-                    summary_data = data
-                else:
-                    # Regular article data
-                    articles.append(data)
-                    
-        except Exception as e:
-            print(f"Warning: Error loading {file_path}: {e}")
+    # Categorize articles
+    priority_counts = dict(conn.execute(
+        "SELECT priority, COUNT(*) FROM files WHERE kind = 'article' GROUP BY priority"
+    ))
+    high_count_total = priority_counts.get('HIGH', 0)
+    medium_count_total = priority_counts.get('MEDIUM', 0)
+    regular_count = priority_counts.get('REGULAR', 0)
+    total_loaded = high_count_total + medium_count_total + regular_count
+    
+    # Best-scoring high-priority articles, then the most recent medium ones.
+    # Scrape times are ISO strings, so they sort chronologically as text
+    high_names = [name for (name,) in conn.execute(
+        "SELECT name FROM files WHERE kind = 'article' AND priority = 'HIGH' "
+        "ORDER BY high_count DESC, scraped DESC, name LIMIT ?", (TOP_HIGH_PRIORITY,)
+    )]
+    medium_names = [name for (name,) in conn.execute(
+        "SELECT name FROM files WHERE kind = 'article' AND priority = 'MEDIUM' "
+        "ORDER BY scraped DESC, name LIMIT ?", (TOP_MEDIUM_PRIORITY,)
+    )]
+    high_priority = load_indexed(defense_data_dir, high_names, summarize_article)
+    medium_priority = load_indexed(defense_data_dir, medium_names, summarize_article)
+    
+    # Summary files are named by timestamp, so the last name is the latest
+    summary_names = [name for (name,) in conn.execute(
+        "SELECT name FROM files WHERE kind = 'summary' ORDER BY name DESC LIMIT 1"
+    )]
+    summaries = load_indexed(defense_data_dir, summary_names,
+                             lambda data: {key: data[key] for key in SUMMARY_FIELDS if key in data})
+    summary_data = summaries[0] if summaries else None
+    
+    # Source breakdown inputs
+    source_rows = pd.read_sql_query(
+        "SELECT source AS source_domain, COALESCE(word_count, 0) AS word_count FROM files WHERE kind = 'article'", conn
+    )
+    conn.close()
     
     # Display summary
     if summary_data:
@@ -49,75 +105,39 @@ def load_and_display_defense_data():
         for source in summary_data.get('sources_scraped', []):
             print(f"     • {source}")
     
-    # Categorize articles
-    high_priority = []
-    medium_priority = []
-    regular = []
-    
-    defense_keywords = {
-        'high': ['nuclear', 'missile', 'agni', 'terrorism', 'attack', 'weapon', 'army', 'navy', 'air force', 'border', 'security'],
-        'medium': ['defense', 'defence', 'military', 'intelligence', 'surveillance', 'police', 'government']
-    }
-    
-    for article in articles:
-        title = article.get('title', '').lower()
-        content = article.get('content', '').lower()
-        text = title + ' ' + content
-        
-        # Count keywords
-        high_count = sum(1 for keyword in defense_keywords['high'] if keyword in text)
-        medium_count = sum(1 for keyword in defense_keywords['medium'] if keyword in text)
-        
-        if high_count >= 2:
-            high_priority.append(article)
-        elif high_count >= 1 or medium_count >= 2:
-            medium_priority.append(article)
-        else:
-            regular.append(article)
-    
     print(f"\n📈 PRIORITY BREAKDOWN:")
-    print(f"   🔴 High Priority: {len(high_priority)} articles")
-    print(f"   🟡 Medium Priority: {len(medium_priority)} articles")
-    print(f"   🟢 Regular: {len(regular)} articles")
-    print(f"   📰 Total Loaded: {len(articles)} articles")
+    print(f"   🔴 High Priority: {high_count_total} articles")
+    print(f"   🟡 Medium Priority: {medium_count_total} articles")
+    print(f"   🟢 Regular: {regular_count} articles")
+    print(f"   📰 Total Loaded: {total_loaded} articles")
     
     # Display top high priority articles
     if high_priority:
         print(f"\n🚨 TOP HIGH PRIORITY DEFENSE INTELLIGENCE:")
         print("-" * 60)
         
-        for i, article in enumerate(high_priority[:10], 1):  # Top 10
-            title = article.get('title', 'Untitled')
-            source = article.get('source_domain', 'Unknown Source')
-            url = article.get('url', '#')
-            word_count = article.get('word_count', 0)
-            timestamp = article.get('scraped_timestamp', '')
-            
-            print(f"\n{i}. 🔴 {title}")
-            print(f"    📍 Source: {source}")
-            print(f"    📏 Words: {word_count}")
-            print(f"    ⏰ Scraped: {timestamp}")
-            print(f"    🔗 URL: {url}")
+        for i, article in enumerate(high_priority, 1):  # Top 10
+            print(f"\n{i}. 🔴 {article['title']}")
+            print(f"    📍 Source: {article['source_domain']}")
+            print(f"    📏 Words: {article['word_count']}")
+            print(f"    ⏰ Scraped: {article['scraped_timestamp']}")
+            print(f"    🔗 URL: {article['url']}")
             
             # Content preview
-            content = article.get('content', '')
-            if content:
-                preview = content[:200] + "..." if len(content) > 200 else content
-                print(f"    📄 Preview: {preview}")
+            if article['preview']:
+                print(f"    📄 Preview: {article['preview']}")
     
     # Display source breakdown
-    source_stats = {}
-    for article in articles:
-        source = article.get('source_domain', 'Unknown')
-        if source not in source_stats:
-            source_stats[source] = {'count': 0, 'words': 0}
-        source_stats[source]['count'] += 1
-        source_stats[source]['words'] += article.get('word_count', 0)
-    
-    if source_stats:
+    if not source_rows.empty:
+        source_stats = (
+            source_rows.groupby('source_domain', sort=False)
+            .agg(count=('word_count', 'size'), words=('word_count', 'sum'))
+            .sort_values('count', ascending=False, kind='stable')
+        )
+        
         print(f"\n📊 SOURCES BREAKDOWN:")
         print("-" * 60)
-        for source, stats in sorted(source_stats.items(), key=lambda x: x[1]['count'], reverse=True):
+        for source, stats in source_stats.iterrows():
             print(f"📺 {source}")
             print(f"   Articles: {stats['count']}")
             print(f"   Total Words: {stats['words']:,}")
@@ -128,11 +148,9 @@ def load_and_display_defense_data():
         print(f"\n🟡 MEDIUM PRIORITY ARTICLES (Top 5):")
         print("-" * 60)
         
-        for i, article in enumerate(medium_priority[:5], 1):
-            title = article.get('title', 'Untitled')
-            source = article.get('source_domain', 'Unknown Source')
-            print(f"{i}. 🟡 {title}")
-            print(f"    📍 {source}")
+        for i, article in enumerate(medium_priority, 1):
+            print(f"{i}. 🟡 {article['title']}")
+            print(f"    📍 {article['source_domain']}")
             print()
     
     # Instructions
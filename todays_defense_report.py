@@ -3,29 +3,46 @@ from datetime import datetime
 
 def generate_todays_defense_report():
     """Generate a comprehensive report of today's defense intelligence."""
-    # Connect to the database
-    conn = sqlite3.connect('defense_intelligence.db')
+    # The report only reads, so open the database read-only: SQLite skips
+    # write-lock bookkeeping and the file is served through mmap. The date
+    # expression index is created by the schema setup in the writers.
+    try:
+        conn = sqlite3.connect('file:defense_intelligence.db?mode=ro', uri=True)
+    except sqlite3.OperationalError as e:
+        print(f"❌ Could not open defense_intelligence.db: {e}")
+        return
     cursor = conn.cursor()
+    cursor.execute('PRAGMA mmap_size = 268435456')
+    cursor.execute('PRAGMA temp_store = MEMORY')
     
     # Get today's date
     today = datetime.now().strftime('%Y-%m-%d')
     
+    # Resolve today's article ids once; every section below joins on them
+    # by rowid instead of re-evaluating the date filter. Temp tables stay
+    # writable on a read-only connection.
+    cursor.execute('CREATE TEMP TABLE todays (id INTEGER PRIMARY KEY)')
+    cursor.execute(
+        "INSERT INTO todays SELECT id FROM articles WHERE date(scraped_timestamp) = ?",
+        (today,)
+    )
+    
     print("=" * 80)
     print(f"🛡️ ARGUS DEFENSE INTELLIGENCE REPORT - {today}")
     print("=" * 80)
     
     # Get today's articles count
-    cursor.execute("SELECT COUNT(*) FROM articles WHERE date(scraped_timestamp) = ?", (today,))
+    cursor.execute("SELECT COUNT(*) FROM todays")
     todays_articles = cursor.fetchone()[0]
     print(f"📰 Total articles collected today: {todays_articles}")
     
     # Get today's articles by threat level
     cursor.execute("""
-        SELECT threat_level, COUNT(*) 
-        FROM articles 
-        WHERE date(scraped_timestamp) = ? 
-        GROUP BY threat_level
-    """, (today,))
+        SELECT a.threat_level, COUNT(*) 
+        FROM todays t
+        JOIN articles a ON a.id = t.id
+        GROUP BY a.threat_level
+    """)
     threat_levels = cursor.fetchall()
     
     print("\n⚠️  TODAY'S THREAT LEVEL DISTRIBUTION:")
@@ -34,12 +51,13 @@ def generate_todays_defense_report():
     
     # Get today's high-threat articles
     cursor.execute("""
-        SELECT title, url, threat_level, relevance_score, detected_categories
-        FROM articles 
-        WHERE date(scraped_timestamp) = ? AND threat_level = 'HIGH'
-        ORDER BY relevance_score DESC
+        SELECT a.title, a.url, a.threat_level, a.relevance_score, a.detected_categories
+        FROM todays t
+        JOIN articles a ON a.id = t.id
+        WHERE a.threat_level = 'HIGH'
+        ORDER BY a.relevance_score DESC
         LIMIT 10
-    """, (today,))
+    """)
     high_threat_articles = cursor.fetchall()
     
     print(f"\n🔴 TOP HIGH-THREAT ARTICLES TODAY:")
@@ -53,13 +71,13 @@ def generate_todays_defense_report():
     # Get today's defense entities
     cursor.execute("""
         SELECT e.type, e.text, COUNT(*) as frequency
-        FROM entities e
-        JOIN articles a ON e.article_id = a.id
-        WHERE date(a.scraped_timestamp) = ? AND e.entity_category = 'DEFENSE'
+        FROM todays t
+        JOIN entities e ON e.article_id = t.id
+        WHERE e.entity_category = 'DEFENSE'
         GROUP BY e.type, e.text
         ORDER BY frequency DESC
         LIMIT 15
-    """, (today,))
+    """)
     defense_entities = cursor.fetchall()
     
     print("🎯 TODAY'S DEFENSE ENTITIES:")
@@ -79,12 +97,12 @@ def generate_todays_defense_report():
     # Get today's defense alerts
     cursor.execute("""
         SELECT a.title, da.alert_level, da.alert_description
-        FROM defense_alerts da
-        JOIN articles a ON da.article_id = a.id
-        WHERE date(a.scraped_timestamp) = ?
+        FROM todays t
+        JOIN articles a ON a.id = t.id
+        JOIN defense_alerts da ON da.article_id = t.id
         ORDER BY da.created_timestamp DESC
         LIMIT 5
-    """, (today,))
+    """)
     alerts = cursor.fetchall()
     
     if alerts:
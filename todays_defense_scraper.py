@@ -6,16 +6,26 @@ Implements enhanced keyword filtering for precise defense relevance detection.
 """
 
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import time
 import json
 import os
 from datetime import datetime, date
 import concurrent.futures
+import functools
+import html
 import threading
 from urllib.parse import urljoin, urlparse
 import re
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+from page_parser import parse_html, select, select_one, node_text, node_attr
+
 # High-impact defense and security keywords (must-have for relevance)
 HIGH_IMPACT_KEYWORDS = [
     'defense', 'defence', 'military', 'army', 'navy', 'air force', 
@@ -45,67 +55,242 @@ GENERAL_KEYWORDS = [
     'security alert', 'threat assessment', 'emergency response'
 ]
 
+def _keyword_regex(keywords):
+    """Compile keywords into one case-insensitive whole-word alternation.
+    
+    Plain substring tests let the short acronyms match inside ordinary words
+    ('ib' in 'possible', 'loc' in 'local'). Common inflections are still
+    accepted, so 'soldiers', 'attacked' and 'bombing' count.
+    """
+    # Longest first so multi-word phrases win over their shorter prefixes
+    ordered = sorted({keyword.strip().lower() for keyword in keywords}, key=len, reverse=True)
+    alternation = '|'.join(re.escape(keyword) for keyword in ordered)
+    return re.compile(r'\b(' + alternation + r')(?:e?s|e?d|ing|ers?)?\b', re.IGNORECASE)
+
+# Compiled once; each article is scanned in a single pass per keyword tier
+_HIGH_IMPACT_RE = _keyword_regex(HIGH_IMPACT_KEYWORDS)
+_GENERAL_RE = _keyword_regex(GENERAL_KEYWORDS)
+
+# Larger pages are cut here rather than buffered whole; article text sits
+# well inside the first couple of megabytes
+MAX_PAGE_BYTES = 2_000_000
+
+# At most this many requests in flight per host, and a minimum spacing,
+# in seconds, between request starts to the same host
+MAX_REQUESTS_PER_HOST = 4
+MIN_HOST_INTERVAL = 1.0
+
+# Article links kept per section page
+MAX_SECTION_LINKS = 15
+
+# Fast path for link extraction: href values of <a> tags read straight from
+# the raw bytes, kept when the path matches one of the a[href*=...] patterns
+_A_HREF_RE = re.compile(rb'<a\b[^<>]{0,500}?\bhref\s*=\s*(["\'])([^"\'<>]+)\1', re.IGNORECASE)
+_ARTICLE_PATH_RE = re.compile(r'/(?:news|article|story|world|india|defence|security)/')
+
+# Selectors are fixed, so they are built once here instead of per article;
+# the link patterns are joined into one group matched in a single traversal
+LINK_SELECTORS = (
+    'a[href*="/news/"]',
+    'a[href*="/article/"]',
+    'a[href*="/story/"]',
+    'a[href*="/world/"]',
+    'a[href*="/india/"]',
+    'a[href*="/defence/"]',
+    'a[href*="/security/"]',
+    '.headline a',
+    '.title a',
+    'h2 a',
+    'h3 a'
+)
+LINK_SELECTORS_COMBINED = ', '.join(LINK_SELECTORS)
+TITLE_SELECTORS = ('h1', 'h2', '.headline', '.title', '.article-title')
+CONTENT_SELECTORS = (
+    'article',
+    '.article-body',
+    '.story-body',
+    '.content',
+    '.post-content',
+    '.entry-content',
+    'main'
+)
+DATE_SELECTORS = (
+    'time',
+    '.publish-date',
+    '.published',
+    '.date',
+    '[datetime]',
+    '.article-date',
+    '.post-date'
+)
+
+# Numeric dates are recognized by shape and built directly; only the
+# month-name forms still go through strptime, so a miss never walks ten
+# failing formats
+_YMD_RE = re.compile(r'(\d{4})[-/](\d{1,2})[-/](\d{1,2})')
+_DMY_RE = re.compile(r'(\d{1,2})[-/](\d{1,2})[-/](\d{4})$')
+_MONTH_FIRST_FORMATS = ('%B %d, %Y', '%b %d, %Y')
+_DAY_FIRST_FORMATS = ('%d %B %Y', '%d %b %Y')
+
+@functools.lru_cache(maxsize=1024)
+def _parse_date(date_str):
+    """Return date_str as YYYY-MM-DD, or None if it isn't a known format.
+    
+    Year-first strings only need their date prefix, so ISO timestamps with
+    a time or UTC offset ('2025-10-15T10:00:00+05:30') are understood too.
+    """
+    match = _YMD_RE.match(date_str) or _DMY_RE.match(date_str)
+    if match:
+        first, second, third = (int(part) for part in match.groups())
+        year, month, day = (first, second, third) if match.re is _YMD_RE else (third, second, first)
+        try:
+            return date(year, month, day).strftime('%Y-%m-%d')
+        except ValueError:
+            return None
+    
+    if date_str[:1].isalpha():
+        formats = _MONTH_FIRST_FORMATS
+    elif date_str[:1].isdigit():
+        formats = _DAY_FIRST_FORMATS
+    else:
+        return None
+    
+    for fmt in formats:
+        try:
+            return datetime.strptime(date_str, fmt).strftime('%Y-%m-%d')
+        except ValueError:
+            continue
+    
+    return None
+
+def write_json(filepath, data):
+    """Write data as indented UTF-8 JSON, using orjson when available."""
+    if orjson is not None:
+        with open(filepath, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+    else:
+        with open(filepath, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+
 class TodaysDefenseNewsScraper:
     def __init__(self):
         self.session = requests.Session()
         self.session.headers.update({
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
         })
+        
+        # Keep connections to each news host alive across threads and retry
+        # transient gateway errors instead of dropping the article
+        adapter = HTTPAdapter(
+            pool_connections=32,
+            pool_maxsize=32,
+            max_retries=Retry(total=2, backoff_factor=0.3, status_forcelist=[502, 503, 504])
+        )
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        
         self.scraped_articles = []
+        # Guards the per-host bookkeeping in _fetch_body and seen_urls
         self.lock = threading.Lock()
+        self.host_slots = {}
+        self.last_fetch = {}
         self.today_date = date.today().strftime('%Y-%m-%d')
+        
+        # Article URLs already queued; links repeated across sections and
+        # sources are only fetched once per scraper
+        self.seen_urls = set()
+    
+    def claim_url(self, url):
+        """Mark url as seen; return False if it was already seen."""
+        with self.lock:
+            if url in self.seen_urls:
+                return False
+            self.seen_urls.add(url)
+            return True
+    
+    def _fetch_body(self, url, timeout, host=None):
+        """GET a page politely, streaming at most MAX_PAGE_BYTES of its body.
+        
+        Each request holds one of its host's MAX_REQUESTS_PER_HOST slots and
+        starts at least MIN_HOST_INTERVAL after the previous one to that
+        host; other hosts never wait on it.
+        """
+        if host is None:
+            host = urlparse(url).netloc
+        with self.lock:
+            slot = self.host_slots.get(host)
+            if slot is None:
+                slot = self.host_slots[host] = threading.BoundedSemaphore(MAX_REQUESTS_PER_HOST)
+            
+            # Reserve this host's next free start time
+            now = time.monotonic()
+            start = max(now, self.last_fetch.get(host, 0.0) + MIN_HOST_INTERVAL)
+            self.last_fetch[host] = start
+        
+        if start > now:
+            time.sleep(start - now)
+        
+        with slot:
+            response = self.session.get(url, timeout=timeout, stream=True)
+            try:
+                response.raise_for_status()
+                # One capped read, inflated by urllib3, straight into a single
+                # bytes object; no chunk list or joined copy
+                return response.raw.read(MAX_PAGE_BYTES, decode_content=True)
+            finally:
+                # Hand the socket back to the pool right away
+                response.close()
     
     def is_defense_relevant(self, title, content):
         """Check if article is relevant using a tiered keyword approach."""
-        text = (title + ' ' + content).lower()
+        text = title + ' ' + content
         
-        # Check for any high-impact keyword (highly likely to be relevant)
-        for keyword in HIGH_IMPACT_KEYWORDS:
-            if keyword.lower() in text:
-                return True
-        
-        # If no high-impact keywords, check for a combination of general keywords
-        general_keyword_count = sum(1 for keyword in GENERAL_KEYWORDS if keyword.lower() in text)
+        # Any high-impact keyword is enough (highly likely to be relevant)
+        if _HIGH_IMPACT_RE.search(text):
+            return True
         
-        # Require at least 3 general keywords to be considered relevant
-        return general_keyword_count >= 3
+        # Otherwise require at least 3 distinct general keywords; stop
+        # scanning as soon as the third one turns up
+        general_keywords = set()
+        for match in _GENERAL_RE.finditer(text):
+            general_keywords.add(match.group(1).lower())
+            if len(general_keywords) >= 3:
+                return True
+        return False
     
     def extract_article_links(self, url):
-        """Extract article links from a news section page."""
+        """Extract article links from a news section page.
+        
+        Links whose path looks like an article are pulled straight from the
+        raw HTML with a regex; the page is only parsed into a tree when that
+        finds fewer than MAX_SECTION_LINKS and the structural selectors
+        (headline/title/h2/h3 anchors) are needed to fill the list.
+        """
         try:
-            response = self.session.get(url, timeout=10)
-            response.raise_for_status()
+            body = self._fetch_body(url, timeout=10)
+            # Insertion-ordered dict keys dedupe in O(1) per link
+            links = {}
             
-            soup = BeautifulSoup(response.content, 'html.parser')
-            links = []
+            def add_link(href):
+                full_url = urljoin(url, href)
+                # Only include links that might be from today
+                if self.is_potentially_today(full_url):
+                    links[full_url] = None
+                return len(links) >= MAX_SECTION_LINKS
             
-            # Common link selectors for news sites
-            link_selectors = [
-                'a[href*="/news/"]',
-                'a[href*="/article/"]',
-                'a[href*="/story/"]',
-                'a[href*="/world/"]',
-                'a[href*="/india/"]',
-                'a[href*="/defence/"]',
-                'a[href*="/security/"]',
-                '.headline a',
-                '.title a',
-                'h2 a',
-                'h3 a'
-            ]
+            for match in _A_HREF_RE.finditer(body):
+                href = html.unescape(match.group(2).decode('utf-8', 'ignore'))
+                if _ARTICLE_PATH_RE.search(href) and add_link(href):
+                    return list(links)
             
-            for selector in link_selectors:
-                elements = soup.select(selector)
-                for element in elements:
-                    href = element.get('href')
-                    if href and isinstance(href, str):
-                        full_url = urljoin(url, href)
-                        # Only include links that might be from today
-                        if self.is_potentially_today(full_url):
-                            if full_url not in links:
-                                links.append(full_url)
+            # One selector group matches every pattern in a single traversal
+            tree = parse_html(body)
+            for element in select(tree, LINK_SELECTORS_COMBINED):
+                href = node_attr(element, 'href')
+                if href and add_link(href):
+                    break
             
-            return links[:15]  # Limit to 15 links per section
+            return list(links)
             
         except Exception as e:
             print(f"Error extracting links from {url}: {e}")
@@ -120,57 +305,47 @@ class TodaysDefenseNewsScraper:
     def scrape_article_content(self, url):
         """Scrape content from a single article."""
         try:
-            response = self.session.get(url, timeout=15)
-            response.raise_for_status()
-            
-            soup = BeautifulSoup(response.content, 'html.parser')
+            # Parsed once; the host drives rate limiting and is stored below
+            host = urlparse(url).netloc
+            tree = parse_html(self._fetch_body(url, timeout=15, host=host))
             
             # Extract publication date if available
-            pub_date = self.extract_publication_date(soup, url)
+            pub_date = self.extract_publication_date(tree, url)
             if pub_date and pub_date != self.today_date:
                 print(f"⏭️  Skipping non-today article (published: {pub_date}): {url}")
                 return None
             
             # Extract title
             title = ""
-            title_selectors = ['h1', 'h2', '.headline', '.title', '.article-title']
-            for selector in title_selectors:
-                title_element = soup.select_one(selector)
-                if title_element and title_element.get_text(strip=True):
-                    title = title_element.get_text(strip=True)
+            for selector in TITLE_SELECTORS:
+                title_element = select_one(tree, selector)
+                title_text = node_text(title_element) if title_element else ''
+                if title_text:
+                    title = title_text
                     break
             
             if not title:
-                title_tag = soup.find('title')
+                title_tag = select_one(tree, 'title')
                 if title_tag:
-                    title = title_tag.get_text(strip=True)
+                    title = node_text(title_tag)
             
             # Extract content
             content = ""
-            content_selectors = [
-                'article',
-                '.article-body',
-                '.story-body',
-                '.content',
-                '.post-content',
-                '.entry-content',
-                'main'
-            ]
             
             content_paragraphs = []
-            for selector in content_selectors:
-                content_container = soup.select_one(selector)
+            for selector in CONTENT_SELECTORS:
+                content_container = select_one(tree, selector)
                 if content_container:
-                    paragraphs = content_container.find_all('p')
+                    paragraphs = select(content_container, 'p')
                     if paragraphs:
-                        content_paragraphs = [p.get_text(strip=True) for p in paragraphs 
-                                            if p.get_text(strip=True) and len(p.get_text(strip=True)) > 30]
+                        texts = (node_text(p) for p in paragraphs)
+                        content_paragraphs = [text for text in texts if text and len(text) > 30]
                         break
             
             if not content_paragraphs:
-                paragraphs = soup.find_all('p')
-                content_paragraphs = [p.get_text(strip=True) for p in paragraphs 
-                                    if p.get_text(strip=True) and len(p.get_text(strip=True)) > 50]
+                paragraphs = select(tree, 'p')
+                texts = (node_text(p) for p in paragraphs)
+                content_paragraphs = [text for text in texts if text and len(text) > 50]
             
             content = '\n\n'.join(content_paragraphs)
             
@@ -191,7 +366,7 @@ class TodaysDefenseNewsScraper:
                 'scraped_timestamp': datetime.now().isoformat(),
                 'content_length': len(content),
                 'word_count': len(content.split()),
-                'source_domain': urlparse(url).netloc,
+                'source_domain': host,
                 'publication_date': pub_date or self.today_date
             }
             
@@ -202,29 +377,19 @@ class TodaysDefenseNewsScraper:
             print(f"Error scraping {url}: {e}")
             return None
     
-    def extract_publication_date(self, soup, url):
+    def extract_publication_date(self, tree, url):
         """Extract publication date from article."""
         # Try various selectors for publication date
-        date_selectors = [
-            'time',
-            '.publish-date',
-            '.published',
-            '.date',
-            '[datetime]',
-            '.article-date',
-            '.post-date'
-        ]
-        
-        for selector in date_selectors:
-            date_element = soup.select_one(selector)
+        for selector in DATE_SELECTORS:
+            date_element = select_one(tree, selector)
             if date_element:
                 # Try to get datetime attribute first
-                if date_element.get('datetime'):
-                    date_str = date_element.get('datetime')
+                date_str = node_attr(date_element, 'datetime')
+                if date_str:
                     return self.parse_date_string(date_str)
                 
                 # Try to get text content
-                date_text = date_element.get_text(strip=True)
+                date_text = node_text(date_element)
                 if date_text:
                     parsed_date = self.parse_date_string(date_text)
                     if parsed_date:
@@ -237,53 +402,38 @@ class TodaysDefenseNewsScraper:
         """Parse various date string formats."""
         if not date_str:
             return None
-        
-        # Common date formats
-        formats = [
-            '%Y-%m-%d',
-            '%Y/%m/%d',
-            '%d-%m-%Y',
-            '%d/%m/%Y',
-            '%Y-%m-%dT%H:%M:%S',
-            '%Y-%m-%d %H:%M:%S',
-            '%B %d, %Y',
-            '%b %d, %Y',
-            '%d %B %Y',
-            '%d %b %Y'
-        ]
-        
-        for fmt in formats:
-            try:
-                parsed_date = datetime.strptime(date_str, fmt)
-                return parsed_date.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        return None
+        return _parse_date(date_str.strip())
     
-    def scrape_source_section(self, source_name, source_config, section):
-        """Scrape articles from a specific source section."""
+    def get_section_links(self, source_name, source_config, section):
+        """Return the article links listed on a source section page."""
         section_url = urljoin(source_config['base_url'], section)
         print(f"🔍 Scanning {source_name} - {section}")
-        
+        return self.extract_article_links(section_url)
+    
+    def collect_article(self, url):
+        """Scrape one article and keep it if it is today's defense news."""
+        article = self.scrape_article_content(url)
+        if article:
+            # list.append is atomic under the GIL; no lock needed
+            self.scraped_articles.append(article)
+    
+    def scrape_source_section(self, source_name, source_config, section):
+        """Scrape articles from a specific source section."""
         try:
-            # Get article links
-            links = self.extract_article_links(section_url)
-            
-            for link in links:
-                article = self.scrape_article_content(link)
-                if article:
-                    with self.lock:
-                        self.scraped_articles.append(article)
-                
-                # Be respectful with delays
-                time.sleep(1)
+            for link in self.get_section_links(source_name, source_config, section):
+                if self.claim_url(link):
+                    self.collect_article(link)
                 
         except Exception as e:
-            print(f"Error scraping section {section_url}: {e}")
+            print(f"Error scraping section {source_name} - {section}: {e}")
     
-    def scrape_defense_news(self, max_workers=3):
-        """Scrape defense news from multiple sources."""
+    def scrape_defense_news(self, max_workers=8):
+        """Scrape defense news from multiple sources.
+        
+        Section pages and individual articles are all scheduled on one pool,
+        so fetches from different hosts overlap; each host is still limited
+        to one request start per MIN_HOST_INTERVAL.
+        """
         print("🛡️ Starting Today's Defense News Intelligence Gathering")
         print("=" * 60)
         print(f"📅 Focusing on articles from: {self.today_date}")
@@ -319,20 +469,21 @@ class TodaysDefenseNewsScraper:
         all_sources = {**INDIAN_DEFENSE_SOURCES, **INTERNATIONAL_SOURCES}
         
         with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-            futures = []
+            section_futures = [
+                executor.submit(self.get_section_links, source_name, source_config, section)
+                for source_name, source_config in all_sources.items()
+                for section in source_config['sections']
+            ]
             
-            for source_name, source_config in all_sources.items():
-                for section in source_config['sections']:
-                    future = executor.submit(
-                        self.scrape_source_section, 
-                        source_name, 
-                        source_config, 
-                        section
-                    )
-                    futures.append(future)
+            # Queue each section's new articles as soon as its links are known
+            article_futures = []
+            for future in concurrent.futures.as_completed(section_futures):
+                for link in future.result():
+                    if self.claim_url(link):
+                        article_futures.append(executor.submit(self.collect_article, link))
             
             # Wait for all scraping to complete
-            concurrent.futures.wait(futures)
+            concurrent.futures.wait(article_futures)
         
         print(f"\n✅ Today's defense intelligence gathering complete!")
         print(f"📊 Total defense articles found: {len(self.scraped_articles)}")
@@ -340,7 +491,11 @@ class TodaysDefenseNewsScraper:
         return self.scraped_articles
     
     def save_articles(self, output_dir="todays_defense_data"):
-        """Save scraped articles to JSON files."""
+        """Save scraped articles to one JSON Lines file plus a JSON summary.
+        
+        Each article is a single line in todays_defense_<timestamp>.jsonl,
+        so a run costs one file open instead of one per article.
+        """
         if not self.scraped_articles:
             print("No articles to save.")
             return
@@ -349,27 +504,22 @@ class TodaysDefenseNewsScraper:
         
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        for i, article in enumerate(self.scraped_articles):
-            # Create clean filename
-            title = article['title']
-            clean_title = re.sub(r'[^\w\s-]', '', title.lower())
-            clean_title = re.sub(r'[-\s]+', '_', clean_title)
-            clean_title = clean_title[:50].strip('_')
-            
-            if not clean_title:
-                clean_title = f"defense_article_{i+1}"
-            
-            filename = f"{clean_title}_{timestamp}_{i+1}.json"
-            filepath = os.path.join(output_dir, filename)
-            
-            try:
-                with open(filepath, 'w', encoding='utf-8') as f:
-                    json.dump(article, f, indent=2, ensure_ascii=False)
-                
-                print(f"💾 Saved: {filepath}")
-                
-            except Exception as e:
-                print(f"Error saving {filepath}: {e}")
+        articles_file = os.path.join(output_dir, f"todays_defense_{timestamp}.jsonl")
+        saved = 0
+        with open(articles_file, 'wb') as f:
+            for article in self.scraped_articles:
+                try:
+                    if orjson is not None:
+                        line = orjson.dumps(article)
+                    else:
+                        line = json.dumps(article, ensure_ascii=False).encode('utf-8')
+                except (TypeError, ValueError) as e:
+                    print(f"Error saving {article.get('url', 'article')}: {e}")
+                    continue
+                f.write(line + b'\n')
+                saved += 1
+        
+        print(f"💾 Saved {saved} articles: {articles_file}")
         
         # Create summary file
         summary = {
@@ -390,8 +540,7 @@ class TodaysDefenseNewsScraper:
         }
         
         summary_file = os.path.join(output_dir, f"todays_defense_summary_{timestamp}.json")
-        with open(summary_file, 'w', encoding='utf-8') as f:
-            json.dump(summary, f, indent=2, ensure_ascii=False)
+        write_json(summary_file, summary)
         
         print(f"📋 Summary saved: {summary_file}")
 
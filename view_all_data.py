@@ -9,11 +9,47 @@ import streamlit as st
 import json
 import os
 import pandas as pd
-from datetime import datetime
+from datetime import datetime, timedelta
 import sqlite3
 from pathlib import Path
 import plotly.express as px
 import plotly.graph_objects as go
+from concurrent.futures import ThreadPoolExecutor
+
+from article_index import PRIORITY_KEYWORDS, load_json
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Threads used to read the JSON files when there is no current snapshot
+LOAD_WORKERS = 8
+
+# Columnar copy of every article, rebuilt whenever the JSON files change
+SNAPSHOT_FILENAME = "articles.parquet"
+SNAPSHOT_FIELDS = [
+    ('url', 'string'), ('title', 'string'), ('content', 'string'),
+    ('source_domain', 'string'), ('word_count', 'int64'), ('content_length', 'int64'),
+    ('scraped_timestamp', 'string'), ('file_name', 'string')
+]
+
+# Stored as a categorical column so the per-rerun priority masks compare small integer codes
+PRIORITY_LEVELS = pd.CategoricalDtype(['high', 'medium', 'regular'])
+
+# How each priority is labelled in the article grid
+PRIORITY_LABELS = {'high': "🔴 HIGH", 'medium': "🟡 MEDIUM", 'regular': "🟢 REGULAR"}
+
+# Date range choices in the sidebar and how far back each one reaches
+DATE_RANGE_HOURS = {"Last 24 hours": 24, "Last 48 hours": 48, "Last week": 24 * 7}
+
+# Filled in for articles missing a field, so the vectorized filters never see nulls
+ARTICLE_DEFAULTS = {
+    'title': '', 'content': '', 'url': '#', 'source_domain': 'Unknown',
+    'word_count': 0, 'scraped_timestamp': ''
+}
 
 # Configure Streamlit page
 st.set_page_config(
@@ -94,66 +130,219 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-def load_all_defense_data():
-    """Load all defense data from the defense_data directory."""
-    defense_data_dir = "defense_data"
+def data_dir_signature(defense_data_dir):
+    """Return (file count, newest mtime) for the JSON files in a directory.
+    
+    Any added, removed or rewritten file changes the signature, which is
+    what invalidates the cached load below.
+    """
+    count = 0
+    newest = 0
+    with os.scandir(defense_data_dir) as entries:
+        for entry in entries:
+            if entry.name.endswith('.json') and entry.is_file():
+                count += 1
+                newest = max(newest, entry.stat().st_mtime_ns)
+    return count, newest
+
+def read_snapshot(defense_data_dir, signature):
+    """Return (articles, summary_data) from the Parquet snapshot.
     
-    if not os.path.exists(defense_data_dir):
-        return [], None
+    Returns None when pyarrow is missing or the snapshot is absent or was
+    written for a different signature.
+    """
+    if pq is None:
+        return None
+    
+    path = os.path.join(defense_data_dir, SNAPSHOT_FILENAME)
+    try:
+        metadata = pq.read_schema(path).metadata or {}
+        if metadata.get(b'signature') != json.dumps(list(signature)).encode():
+            return None
+        table = pq.read_table(path)
+    except (OSError, pa.ArrowException):
+        return None
+    
+    # Columns an article never had come back as nulls; drop them so .get() defaults still apply
+    articles = [
+        {key: value for key, value in row.items() if value is not None}
+        for row in table.to_pylist()
+    ]
+    return articles, json.loads(metadata[b'summary'])
+
+def write_snapshot(defense_data_dir, signature, articles, summary_data):
+    """Write the articles to the Parquet snapshot, tagged with the signature."""
+    if pa is None:
+        return
+    
+    path = os.path.join(defense_data_dir, SNAPSHOT_FILENAME)
+    schema = pa.schema(
+        [(name, getattr(pa, type_name)()) for name, type_name in SNAPSHOT_FIELDS],
+        metadata={
+            'signature': json.dumps(list(signature)),
+            'summary': json.dumps(summary_data)
+        }
+    )
+    try:
+        table = pa.Table.from_pylist(articles, schema=schema)
+        pq.write_table(table, path + '.tmp')
+        os.replace(path + '.tmp', path)
+    except (OSError, TypeError, pa.ArrowException) as e:
+        st.warning(f"Could not write {path}: {e}")
+
+def _read_json_file(file_path):
+    """Parse one JSON file, returning (data, None) or (None, exception).
+    
+    Runs on worker threads, so errors are handed back for the caller to
+    report rather than shown from here.
+    """
+    try:
+        return load_json(file_path), None
+    except Exception as e:
+        return None, e
+
+def _load_defense_data(defense_data_dir, signature):
+    """Load every article in the directory.
+    
+    Reads the Parquet snapshot when it is current, otherwise parses the
+    JSON files and refreshes the snapshot.
+    """
+    snapshot = read_snapshot(defense_data_dir, signature)
+    if snapshot is not None:
+        return snapshot
     
     articles = []
     summary_data = None
     
-    # Load all JSON files
-    for file_path in Path(defense_data_dir).glob("*.json"):
+    # Read and parse the JSON files on a thread pool so file reads overlap
+    file_paths = list(Path(defense_data_dir).glob("*.json"))
+    with ThreadPoolExecutor(max_workers=LOAD_WORKERS) as executor:
+        results = list(executor.map(_read_json_file, file_paths))
+    
+    for file_path, (data, error) in zip(file_paths, results):
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
+            if error is not None:
+                raise error
+            
+            # Check if it's a summary file
+            if 'total_articles' in data and 'articles' in data:
+                # Only the header fields are shown, so the embedded article list isn't kept
+                summary_data = {key: value for key, value in data.items() if key != 'articles'}
+            else:
+                # Regular article data
+                data['file_name'] = file_path.name
+                articles.append(data)
                 
-                # Check if it's a summary file
-                if 'total_articles' in data and 'articles' in data:
-                    summary_data = data
-                else:
-                    # Regular article data
-                    data['file_name'] = file_path.name
-                    articles.append(data)
-                    
         except Exception as e:
             st.warning(f"Error loading {file_path}: {e}")
     
+    write_snapshot(defense_data_dir, signature, articles, summary_data)
     return articles, summary_data
 
-def categorize_articles(articles):
-    """Categorize articles by defense relevance."""
-    high_priority = []
-    medium_priority = []
-    regular = []
-    
-    defense_keywords = {
-        'high': ['nuclear', 'missile', 'agni', 'terrorism', 'attack', 'weapon', 'army', 'navy', 'air force', 'border', 'security'],
-        'medium': ['defense', 'defence', 'military', 'intelligence', 'surveillance', 'police', 'government']
-    }
+@st.cache_resource(max_entries=1, show_spinner=False)
+def _load_article_frame(defense_data_dir, signature):
+    """Build the categorized article DataFrame (cached per signature).
+    
+    The frame is shared between reruns without copying, so callers must
+    filter it rather than modify it in place.
+    """
+    articles, summary_data = _load_defense_data(defense_data_dir, signature)
+    
+    articles_df = pd.DataFrame(articles)
+    for column, default in ARTICLE_DEFAULTS.items():
+        articles_df[column] = articles_df[column].fillna(default) if column in articles_df else default
+    
+    # Parsed once per load for the date range filter
+    articles_df['scraped_dt'] = parse_scraped_times(articles_df['scraped_timestamp'])
+    
+    # Display form for cards and the grid; unparseable times fall back to their first 16 characters
+    scraped_time = articles_df['scraped_dt'].dt.strftime("%Y-%m-%d %H:%M")
+    scraped_time = scraped_time.fillna(articles_df['scraped_timestamp'].str.slice(0, 16))
+    articles_df['scraped_time'] = scraped_time.mask(articles_df['scraped_timestamp'] == '', "Unknown")
+    
+    # Previews never change after scraping, so cards and the grid read this instead of content
+    articles_df['content_preview'] = truncate_text(articles_df['content'], 200)
+    
+    # Lowercased once per load; categorization and search both read these
+    articles_df['title_lower'] = articles_df['title'].str.lower()
+    articles_df['content_lower'] = articles_df['content'].str.lower()
+    articles_df['priority'] = categorize_articles(articles_df)
+    
+    # Distinct sources for the sidebar, so reruns don't rescan the column
+    sources = list(articles_df['source_domain'].unique())
+    return articles_df, sources, summary_data
+
+def load_article_frame():
+    """Load all defense data as (articles DataFrame, distinct sources, summary data)."""
+    defense_data_dir = "defense_data"
     
-    for article in articles:
-        title = article.get('title', '').lower()
-        content = article.get('content', '').lower()
-        text = title + ' ' + content
-        
-        # Count high priority keywords
-        high_count = sum(1 for keyword in defense_keywords['high'] if keyword in text)
-        medium_count = sum(1 for keyword in defense_keywords['medium'] if keyword in text)
-        
-        if high_count >= 2:
-            high_priority.append(article)
-        elif high_count >= 1 or medium_count >= 2:
-            medium_priority.append(article)
-        else:
-            regular.append(article)
-    
-    return high_priority, medium_priority, regular
+    if not os.path.exists(defense_data_dir):
+        return pd.DataFrame(), [], None
+    
+    # Reruns only re-parse the files when the directory contents changed
+    return _load_article_frame(defense_data_dir, data_dir_signature(defense_data_dir))
+
+def count_keywords(texts, keywords, limit):
+    """Count distinct keywords present in each row of a frame of lowercased text.
+    
+    A keyword counts once per row if any column contains it. Rows drop out
+    of the scan once they reach limit, so counts are capped there and later
+    keywords only search the rows still undecided.
+    """
+    count = pd.Series(0, index=texts.index)
+    pending = texts
+    for keyword in keywords:
+        hits = pending.iloc[:, 0].str.contains(keyword, regex=False)
+        for column in pending.columns[1:]:
+            hits |= pending[column].str.contains(keyword, regex=False)
+        count[hits.index] += hits
+        pending = pending[count[pending.index] < limit]
+        if pending.empty:
+            break
+    return count
 
-def display_article_card(article, priority="regular"):
-    """Display an article in a card format."""
+def parse_scraped_times(timestamps):
+    """Parse ISO scrape times into naive local datetimes; unparseable ones become NaT.
+    
+    The scrapers write naive local times, which are kept as they are. Times
+    carrying an offset (or 'Z') are converted to local time first, so both
+    kinds line up against a local cutoff.
+    """
+    # utc=True lets mixed naive/offset values parse together; naive ones
+    # come back unshifted, so dropping the zone restores their wall time
+    parsed = pd.to_datetime(timestamps, utc=True, errors='coerce', format='ISO8601')
+    local = parsed.dt.tz_localize(None)
+    
+    has_offset = timestamps.str.contains(r'T.*(?:Z|[+-]\d{2}:?\d{2})$', regex=True) & parsed.notna()
+    if has_offset.any():
+        # Rare, so converted one by one with the local zone's rules for each date
+        local[has_offset] = parsed[has_offset].map(lambda ts: datetime.fromtimestamp(ts.timestamp()))
+    return local
+
+def truncate_text(text, limit):
+    """Cut a text Series to limit characters, appending "..." to rows that were cut."""
+    return text.where(text.str.len() <= limit, text.str.slice(0, limit) + "...")
+
+def categorize_articles(articles_df):
+    """Categorize articles by defense relevance.
+    
+    Returns a Series of 'high', 'medium' or 'regular' aligned with the frame.
+    """
+    # Title and content are scanned separately, so no joined copy of the text is built
+    texts = articles_df[['title_lower', 'content_lower']]
+    
+    # Two high keywords settle it; medium keywords only matter when no high keyword was found
+    high_count = count_keywords(texts, PRIORITY_KEYWORDS['high'], 2)
+    medium_count = count_keywords(texts[high_count == 0], PRIORITY_KEYWORDS['medium'], 2)
+    
+    priority = pd.Series('regular', index=articles_df.index)
+    priority[medium_count.index[medium_count >= 2]] = 'medium'
+    priority[high_count >= 1] = 'medium'
+    priority[high_count >= 2] = 'high'
+    return priority.astype(PRIORITY_LEVELS)
+
+def article_card_html(article, priority="regular"):
+    """Return the HTML for an article in a card format."""
     css_class = "article-card"
     if priority == "high":
         css_class += " high-priority"
@@ -164,42 +353,48 @@ def display_article_card(article, priority="regular"):
     url = article.get('url', '#')
     source = article.get('source_domain', 'Unknown Source')
     word_count = article.get('word_count', 0)
-    timestamp = article.get('scraped_timestamp', '')
-    content_preview = article.get('content', '')[:200] + "..." if len(article.get('content', '')) > 200 else article.get('content', '')
-    
-    # Format timestamp
-    try:
-        if timestamp:
-            dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
-            formatted_time = dt.strftime("%Y-%m-%d %H:%M")
-        else:
-            formatted_time = "Unknown"
-    except:
-        formatted_time = timestamp[:16] if len(timestamp) > 16 else timestamp
+    formatted_time = article['scraped_time']
+    content_preview = article['content_preview']
     
     priority_icon = "🔴" if priority == "high" else ("🟡" if priority == "medium" else "🟢")
     
-    st.markdown(f"""
-    <div class="{css_class}">
-        <h4>{priority_icon} {title}</h4>
-        <p><strong>Source:</strong> {source}</p>
-        <p><strong>Word Count:</strong> {word_count} | <strong>Scraped:</strong> {formatted_time}</p>
-        <p><strong>Preview:</strong> {content_preview}</p>
-        <p><a href="{url}" target="_blank">🔗 View Original Article</a></p>
-    </div>
-    """, unsafe_allow_html=True)
+    return f"""
+<div class="{css_class}">
+    <h4>{priority_icon} {title}</h4>
+    <p><strong>Source:</strong> {source}</p>
+    <p><strong>Word Count:</strong> {word_count} | <strong>Scraped:</strong> {formatted_time}</p>
+    <p><strong>Preview:</strong> {content_preview}</p>
+    <p><a href="{url}" target="_blank">🔗 View Original Article</a></p>
+</div>
+"""
 
-def get_source_statistics(articles):
-    """Get statistics by source."""
-    source_stats = {}
-    for article in articles:
-        source = article.get('source_domain', 'Unknown')
-        if source not in source_stats:
-            source_stats[source] = {'count': 0, 'words': 0}
-        source_stats[source]['count'] += 1
-        source_stats[source]['words'] += article.get('word_count', 0)
-    
-    return source_stats
+def display_article_cards(articles, priority="regular"):
+    """Display articles as cards in a single markdown element."""
+    st.markdown(
+        "".join(article_card_html(article, priority) for article in articles),
+        unsafe_allow_html=True
+    )
+
+def get_source_statistics(articles_df):
+    """Get statistics by source as a DataFrame of Source, Articles and Total Words."""
+    return (
+        articles_df.groupby('source_domain', sort=False)
+        .agg(Articles=('url', 'size'), **{'Total Words': ('word_count', 'sum')})
+        .rename_axis('Source')
+        .reset_index()
+    )
+
+@st.cache_data(show_spinner=False)
+def build_source_charts(source_df):
+    """Build the per-source pie and bar charts (cached per statistics frame)."""
+    fig1 = px.pie(source_df, values='Articles', names='Source', 
+                 title="Articles by Source")
+    
+    fig2 = px.bar(source_df, x='Source', y='Total Words',
+                 title="Content Volume by Source")
+    fig2.update_layout(xaxis_tickangle=45)
+    
+    return fig1, fig2
 
 def main():
     """Main application."""
@@ -214,9 +409,9 @@ def main():
     
     # Load all defense data
     with st.spinner("Loading all defense intelligence data..."):
-        articles, summary_data = load_all_defense_data()
+        articles_df, sources, summary_data = load_article_frame()
     
-    if not articles:
+    if articles_df.empty:
         st.warning("⚠️ No defense data found. Please run the defense scraper first:")
         st.code("python defense_scraper.py")
         return
@@ -225,7 +420,6 @@ def main():
     st.sidebar.header("🎯 Data Filters")
     
     # Source filter
-    sources = list(set(article.get('source_domain', 'Unknown') for article in articles))
     selected_sources = st.sidebar.multiselect(
         "Filter by Source:",
         sources,
@@ -236,7 +430,7 @@ def main():
     st.sidebar.subheader("📅 Date Range")
     show_last_hours = st.sidebar.selectbox(
         "Show articles from:",
-        ["All time", "Last 24 hours", "Last 48 hours", "Last week"]
+        ["All time"] + list(DATE_RANGE_HOURS)
     )
     
     # Priority filter
@@ -246,13 +440,17 @@ def main():
     )
     
     # Filter articles
-    filtered_articles = [
-        article for article in articles 
-        if article.get('source_domain', 'Unknown') in selected_sources
-    ]
+    filtered_articles = articles_df[articles_df['source_domain'].isin(selected_sources)]
     
-    # Categorize articles
-    high_priority, medium_priority, regular = categorize_articles(filtered_articles)
+    if show_last_hours in DATE_RANGE_HOURS:
+        # Scrape times are naive local times, so the cutoff is too
+        cutoff = pd.Timestamp(datetime.now() - timedelta(hours=DATE_RANGE_HOURS[show_last_hours]))
+        filtered_articles = filtered_articles[filtered_articles['scraped_dt'] >= cutoff]
+    
+    # Split by the priority computed at load time
+    high_priority = filtered_articles[filtered_articles['priority'] == 'high']
+    medium_priority = filtered_articles[filtered_articles['priority'] == 'medium']
+    regular = filtered_articles[filtered_articles['priority'] == 'regular']
     
     # Apply priority filter
     if priority_filter == "High Priority":
@@ -298,31 +496,24 @@ def main():
     
     # Source distribution chart
     st.subheader("📈 Data Collection by Source")
-    source_stats = get_source_statistics(filtered_articles)
+    source_df = get_source_statistics(filtered_articles)
     
-    if source_stats:
-        source_df = pd.DataFrame([
-            {'Source': source, 'Articles': stats['count'], 'Total Words': stats['words']}
-            for source, stats in source_stats.items()
-        ])
+    if not source_df.empty:
+        # Figures are only rebuilt when the filtered statistics change
+        fig1, fig2 = build_source_charts(source_df)
         
         col1, col2 = st.columns(2)
         
         with col1:
-            fig1 = px.pie(source_df, values='Articles', names='Source', 
-                         title="Articles by Source")
             st.plotly_chart(fig1, use_container_width=True)
         
         with col2:
-            fig2 = px.bar(source_df, x='Source', y='Total Words',
-                         title="Content Volume by Source")
-            fig2.update_layout(xaxis_tickangle=45)
             st.plotly_chart(fig2, use_container_width=True)
     
     # Key Defense Topics
     st.subheader("🎯 Key Defense Intelligence Topics")
     
-    if high_priority:
+    if not high_priority.empty:
         st.markdown("""
         <div style="background: linear-gradient(90deg, #dc2626 0%, #b91c1c 100%); 
                     color: white; padding: 15px; border-radius: 10px; margin: 10px 0; 
@@ -331,10 +522,9 @@ def main():
             <p style="color: #fecaca; margin: 5px 0 0 0;">Critical defense and security information requiring immediate attention</p>
         </div>
         """, unsafe_allow_html=True)
-        for article in high_priority[:10]:  # Show top 10
-            display_article_card(article, "high")
+        display_article_cards(high_priority.head(10).to_dict('records'), "high")  # Show top 10
     
-    if medium_priority and priority_filter in ["All", "Medium Priority"]:
+    if not medium_priority.empty and priority_filter in ["All", "Medium Priority"]:
         st.markdown("""
         <div style="background: linear-gradient(90deg, #f59e0b 0%, #d97706 100%); 
                     color: white; padding: 15px; border-radius: 10px; margin: 10px 0; 
@@ -343,8 +533,7 @@ def main():
             <p style="color: #fef3c7; margin: 5px 0 0 0;">Important defense and security developments</p>
         </div>
         """, unsafe_allow_html=True)
-        for article in medium_priority[:10]:  # Show top 10
-            display_article_card(article, "medium")
+        display_article_cards(medium_priority.head(10).to_dict('records'), "medium")  # Show top 10
     
     # All articles view
     st.subheader(f"📋 All Articles ({len(display_articles)} total)")
@@ -353,58 +542,36 @@ def main():
     search_term = st.text_input("🔍 Search articles:", placeholder="Enter keywords...")
     
     if search_term:
-        search_results = [
-            article for article in display_articles
-            if search_term.lower() in article.get('title', '').lower() or 
-               search_term.lower() in article.get('content', '').lower()
-        ]
-        st.write(f"Found {len(search_results)} articles matching '{search_term}'")
-        display_articles = search_results
-    
-    # Pagination
-    articles_per_page = 20
-    total_pages = (len(display_articles) + articles_per_page - 1) // articles_per_page
-    
-    if total_pages > 1:
-        page = st.selectbox("📄 Page", range(1, total_pages + 1))
-        start_idx = (page - 1) * articles_per_page
-        end_idx = start_idx + articles_per_page
-        page_articles = display_articles[start_idx:end_idx]
-    else:
-        page_articles = display_articles
-    
-    # Display articles
-    for i, article in enumerate(page_articles):
-        priority = "high" if article in high_priority else ("medium" if article in medium_priority else "regular")
-        
-        with st.expander(f"{i+1}. {article.get('title', 'Untitled')}", expanded=False):
-            col1, col2 = st.columns([3, 1])
-            
-            with col1:
-                st.write(f"**Source:** {article.get('source_domain', 'Unknown')}")
-                st.write(f"**URL:** [{article.get('url', '#')}]({article.get('url', '#')})")
-                st.write(f"**Scraped:** {article.get('scraped_timestamp', 'Unknown')}")
-                st.write(f"**Word Count:** {article.get('word_count', 0)}")
-                
-                # Content preview
-                content = article.get('content', '')
-                if len(content) > 500:
-                    st.write("**Content Preview:**")
-                    st.text_area("Content Preview", content[:500] + "...", height=100, disabled=True, key=f"content_{i}", label_visibility="hidden")
-                else:
-                    st.write("**Full Content:**")
-                    st.text_area("Full Content", content, height=150, disabled=True, key=f"full_content_{i}", label_visibility="hidden")
-            
-            with col2:
-                priority_color = "#dc2626" if priority == "high" else ("#f59e0b" if priority == "medium" else "#10b981")
-                st.markdown(f"""
-                <div style="background: {priority_color}; color: white; padding: 10px; border-radius: 5px; text-align: center;">
-                    <strong>Priority: {priority.upper()}</strong>
-                </div>
-                """, unsafe_allow_html=True)
-                
-                if st.button(f"🔗 Open Article", key=f"open_{i}"):
-                    st.markdown(f'<a href="{article.get("url", "#")}" target="_blank">Click here to open</a>', unsafe_allow_html=True)
+        # Lowercase the term once and match it against the columns lowercased at load
+        term = search_term.lower()
+        matches = (
+            display_articles['title_lower'].str.contains(term, regex=False) |
+            display_articles['content_lower'].str.contains(term, regex=False)
+        )
+        display_articles = display_articles[matches]
+        st.write(f"Found {len(display_articles)} articles matching '{search_term}'")
+    
+    # One virtualized grid instead of an expander per article; the frontend scrolls it
+    st.dataframe(
+        pd.DataFrame({
+            'Priority': display_articles['priority'].map(PRIORITY_LABELS),
+            'Title': display_articles['title'],
+            'Source': display_articles['source_domain'],
+            'Scraped': display_articles['scraped_time'],
+            'Words': display_articles['word_count'],
+            'URL': display_articles['url'],
+            'Preview': display_articles['content_preview']
+        }),
+        column_config={
+            'Priority': st.column_config.TextColumn(width="small"),
+            'Title': st.column_config.TextColumn(width="large"),
+            'Words': st.column_config.NumberColumn(format="%d"),
+            'URL': st.column_config.LinkColumn(),
+            'Preview': st.column_config.TextColumn(width="large")
+        },
+        hide_index=True,
+        use_container_width=True
+    )
     
     # Summary information
     st.sidebar.markdown("---")
@@ -429,6 +596,7 @@ def main():
     
     if st.sidebar.button("🔄 Refresh Data"):
         st.cache_data.clear()
+        st.cache_resource.clear()
         st.rerun()
     
     if st.sidebar.button("📊 Run AI Analysis"):